@@ -1,19 +1,173 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 import os
-import json
-import uuid
-from typing import Any, Dict
+import secrets
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv, find_dotenv
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator, model_validator
+
+class OrJSONProvider(JSONProvider):
+    """orjson-backed JSON provider, so jsonify, request.get_json and test-client
+    response.get_json use the same encoder/decoder as the hot-path helpers.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+def _orjson_default(obj: Any) -> Any:
+    # Types Flask's default provider serializes that orjson does not
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 application = Flask(__name__)
+application.json = OrJSONProvider(application)
 
 # Prefer local .env for development; fall back to process env (e.g., Render)
 _env_path = find_dotenv()
 if _env_path:
     load_dotenv(_env_path, override=True)
 
-# In-memory storage for proposals (for demonstration purposes)
-proposals = {}
+class InMemoryProposalStore(dict):
+    """In-process proposal storage that also caches each proposal's serialized JSON,
+    so repeated GETs during human review skip re-encoding. Any write to a key drops
+    its cached bytes; callers must write back after mutating an entry.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._json: Dict[str, bytes] = {}
+        # Writes and cache fills are serialized, so a GET can't cache bytes dumped
+        # from a proposal that a concurrent approval has since replaced
+        self._lock = threading.Lock()
+
+    def __setitem__(self, proposal_id: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            super().__setitem__(proposal_id, value)
+            self._json.pop(proposal_id, None)
+
+    def __delitem__(self, proposal_id: str) -> None:
+        with self._lock:
+            super().__delitem__(proposal_id)
+            self._json.pop(proposal_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._json.clear()
+
+    # dict's C-level mutators don't route through __setitem__/__delitem__,
+    # so each one drops the cached bytes itself
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            super().update(*args, **kwargs)
+            self._json.clear()
+
+    def __ior__(self, other: Any) -> 'InMemoryProposalStore':
+        self.update(other)
+        return self
+
+    def pop(self, proposal_id: str, *default: Any) -> Any:
+        with self._lock:
+            self._json.pop(proposal_id, None)
+            return super().pop(proposal_id, *default)
+
+    def popitem(self) -> Any:
+        with self._lock:
+            item = super().popitem()
+            self._json.pop(item[0], None)
+            return item
+
+    def setdefault(self, proposal_id: str, default: Any = None) -> Any:
+        with self._lock:
+            self._json.pop(proposal_id, None)
+            return super().setdefault(proposal_id, default)
+
+    def get_json(self, proposal_id: str) -> Optional[bytes]:
+        """Serialized proposal, or None if there is no such proposal."""
+        cached = self._json.get(proposal_id)
+        if cached is None:
+            with self._lock:
+                cached = self._json.get(proposal_id)
+                if cached is None:
+                    proposal = self.get(proposal_id)
+                    if proposal is None:
+                        return None
+                    cached = orjson.dumps(proposal, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+                    self._json[proposal_id] = cached
+        return cached
+
+class RedisProposalStore:
+    """Proposal storage shared across worker processes, keyed by proposal_id.
+    Implements the subset of the dict interface used by the endpoints; values are
+    stored as orjson bytes, so callers must write back after mutating an entry.
+    Entries expire after ttl_seconds, so lookups use a single GET (get/get_json)
+    rather than an EXISTS check followed by a read.
+    """
+
+    def __init__(self, client: Any, ttl_seconds: int = 86400, prefix: str = 'prop:'):
+        self._client = client
+        self._ttl = ttl_seconds
+        self._prefix = prefix
+
+    def _key(self, proposal_id: str) -> str:
+        return f"{self._prefix}{proposal_id}"
+
+    def __contains__(self, proposal_id: str) -> bool:
+        return bool(self._client.exists(self._key(proposal_id)))
+
+    def __getitem__(self, proposal_id: str) -> Dict[str, Any]:
+        proposal = self.get(proposal_id)
+        if proposal is None:
+            raise KeyError(proposal_id)
+        return proposal
+
+    def get(self, proposal_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._client.get(self._key(proposal_id))
+        return None if raw is None else orjson.loads(raw)
+
+    def get_json(self, proposal_id: str) -> Optional[bytes]:
+        """Serialized proposal, or None if there is no such proposal."""
+        return self._client.get(self._key(proposal_id))
+
+    def __setitem__(self, proposal_id: str, value: Dict[str, Any]) -> None:
+        self._client.set(self._key(proposal_id), orjson.dumps(value, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS), ex=self._ttl)
+
+    def __delitem__(self, proposal_id: str) -> None:
+        if not self._client.delete(self._key(proposal_id)):
+            raise KeyError(proposal_id)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=f"{self._prefix}*"):
+            self._client.delete(key)
+
+def _make_proposal_store():
+    """Shared Redis store when REDIS_URL is set (required for multi-worker deploys);
+    otherwise in-process memory.
+    """
+    url = os.environ.get('REDIS_URL')
+    if not url:
+        return InMemoryProposalStore()
+    import redis
+    ttl = int(os.environ.get('PROPOSAL_TTL_SECONDS', 86400))
+    return RedisProposalStore(redis.Redis.from_url(url), ttl_seconds=ttl)
+
+# Proposal storage: in-memory by default, Redis-backed when REDIS_URL is configured
+proposals = _make_proposal_store()
+
+# Single background writer for best-effort on-disk artifacts. Jobs run in submission
+# order, so a proposal's cleanup always runs after its pending writes.
+_artifact_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='artifact-io')
 
 @application.route('/', methods=['GET'])
 def root():
@@ -25,50 +179,98 @@ def health_check():
     """Health check endpoint."""
     return jsonify({"status": "healthy"})
 
+def _json_bytes_response(body: bytes, code: int = 200):
+    """Response for an already-serialized JSON body."""
+    return application.response_class(body, status=code, mimetype='application/json')
+
+def _json_response(obj: Any, code: int = 200):
+    """orjson-backed replacement for jsonify on the request hot paths."""
+    return _json_bytes_response(orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS), code)
+
 def _error(message: str, code: int):
-    return jsonify({"error": message, "success": False}), code
+    return _json_response({"error": message, "success": False}, code)
+
+# Request schemas per api_documentation.md. Models are built once at import; extra
+# fields are allowed so older payloads (e.g. custody_wallet in config) keep working.
+VALID_APPROVAL_DECISIONS = ("approve_all", "reject_all", "partial")
+
+class TransactionLimits(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    single: Any
+    daily: Any
+
+class RiskConfig(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    min_balance_usd: Any
+    transaction_limits: TransactionLimits
+
+class SubmitConfig(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    user_id: Any
+    risk_config: RiskConfig
+    # user_notes is optional per API documentation
+
+class PaymentApproval(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    proposal_id: Any
+    custody_wallet: Any
+    private_key: Any
+    approval_decision: Any
+    approved_payments: Any = None
+    # comments is optional per API documentation
+
+    @field_validator('approval_decision')
+    @classmethod
+    def _check_decision(cls, value: Any) -> Any:
+        if value not in VALID_APPROVAL_DECISIONS:
+            raise ValueError(f"Invalid approval_decision. Must be one of: {', '.join(VALID_APPROVAL_DECISIONS)}")
+        return value
+
+    @model_validator(mode='after')
+    def _check_partial(self) -> 'PaymentApproval':
+        # For partial approval, approved_payments is required
+        if self.approval_decision == "partial":
+            if 'approved_payments' not in self.model_fields_set:
+                raise ValueError("approved_payments is required for partial approval")
+            if not isinstance(self.approved_payments, list):
+                raise ValueError("approved_payments must be an array")
+        return self
+
+def _validation_message(err: ValidationError) -> str:
+    """Condenses the first pydantic error into the API's single-line error message."""
+    first = err.errors()[0]
+    loc = first['loc']
+    path = '.'.join(str(p) for p in loc)
+    kind = first['type']
+    if not loc:
+        if kind == 'value_error':
+            return str(first['ctx']['error'])
+        return "Request body must be a JSON object"
+    if kind == 'missing':
+        return f"Missing required field: {path}" if len(loc) == 1 else f"{path} is required"
+    if kind == 'model_type':
+        return f"{path} must be an object"
+    if kind == 'value_error':
+        return str(first['ctx']['error'])
+    return f"Invalid {path}: {first['msg']}"
 
 def _validate_config(cfg: Dict[str, Any]) -> None:
     """Raises ValueError if config is invalid per api_documentation.md."""
-    required_top = ["user_id", "risk_config"]
-    for k in required_top:
-        if k not in cfg:
-            raise ValueError(f"Missing required field: {k}")
-    risk = cfg.get("risk_config")
-    if not isinstance(risk, dict):
-        raise ValueError("risk_config must be an object")
-    if "min_balance_usd" not in risk:
-        raise ValueError("risk_config.min_balance_usd is required")
-    tx = risk.get("transaction_limits")
-    if not isinstance(tx, dict):
-        raise ValueError("risk_config.transaction_limits is required")
-    for k in ("single", "daily"):
-        if k not in tx:
-            raise ValueError(f"risk_config.transaction_limits.{k} is required")
-    # user_notes is optional per API documentation
+    try:
+        SubmitConfig.model_validate(cfg)
+    except ValidationError as e:
+        raise ValueError(_validation_message(e)) from None
 
 def _validate_payment_approval(data: Dict[str, Any]) -> None:
     """Raises ValueError if payment approval data is invalid per api_documentation.md."""
-    required_fields = ["proposal_id", "custody_wallet", "private_key", "approval_decision"]
-    for field in required_fields:
-        if field not in data:
-            raise ValueError(f"Missing required field: {field}")
-    
-    approval_decision = data.get("approval_decision")
-    valid_decisions = ["approve_all", "reject_all", "partial"]
-    if approval_decision not in valid_decisions:
-        raise ValueError(f"Invalid approval_decision. Must be one of: {', '.join(valid_decisions)}")
-    
-    # For partial approval, approved_payments is required
-    if approval_decision == "partial":
-        if "approved_payments" not in data:
-            raise ValueError("approved_payments is required for partial approval")
-        if not isinstance(data["approved_payments"], list):
-            raise ValueError("approved_payments must be an array")
-    
-    # comments is optional per API documentation
+    try:
+        PaymentApproval.model_validate(data)
+    except ValidationError as e:
+        raise ValueError(_validation_message(e)) from None
 
+@lru_cache(maxsize=1)
 def _make_output_dir() -> str:
+    """Resolves and creates the artifact directory once per process."""
     root = os.path.abspath(os.path.dirname(__file__))
     # Allow override via environment for deploys; default to project-local 'tmp'
     configured = os.environ.get('AGENT_STORAGE_DIR')
@@ -87,46 +289,63 @@ def _cleanup_proposal_artifacts(proposal_id: str) -> None:
             os.path.join(out_dir, f"proposal_{proposal_id}.json"),
             os.path.join(out_dir, f"execution_result_{proposal_id}.json"),
         ]
+        # These are the only artifacts written per proposal, so remove them by name
+        # instead of scanning the whole (shared, ever-growing) output directory
         for path in candidates:
-            if os.path.exists(path):
-                try:
-                    os.remove(path)
-                except Exception:
-                    pass
-        # Also remove any other files that include the proposal_id substring
-        try:
-            for name in os.listdir(out_dir):
-                if proposal_id in name:
-                    p = os.path.join(out_dir, name)
-                    if os.path.isfile(p):
-                        try:
-                            os.remove(p)
-                        except Exception:
-                            pass
-        except Exception:
-            pass
+            try:
+                os.remove(path)
+            except OSError:
+                pass
         # Optional: if the directory is empty, leave it as-is to avoid race conditions
     except Exception:
         pass
 
+def _write_artifact(path: str, payload: bytes) -> None:
+    """Best-effort write of a serialized artifact. Swallows all IO errors."""
+    try:
+        with open(path, 'wb') as f:
+            f.write(payload)
+    except Exception:
+        pass
+
+def _structured_crew_output(result: Any) -> Optional[Dict[str, Any]]:
+    """Returns the structured payload a CrewOutput already carries (json_dict or pydantic), if any."""
+    json_dict = getattr(result, 'json_dict', None)
+    if json_dict is not None:
+        return json_dict
+    model = getattr(result, 'pydantic', None)
+    if model is not None:
+        return model.model_dump()
+    return None
+
 def id_provider() -> str:
-    """DI-friendly proposal id provider."""
-    return str(uuid.uuid4())
+    """DI-friendly proposal id provider (128-bit CSPRNG hex)."""
+    return secrets.token_hex(16)
 
-def generate_payment_proposal_adapter(context: Dict[str, Any]):
-    """DI-friendly adapter to call the crew. Tests monkeypatch this symbol.
-    Import crew lazily to avoid side effects at import-time.
+_crew = None
+_crew_lock = threading.Lock()
+
+def _get_crew():
+    """Process-wide TreasuryCrew, built on first use and reused across requests.
+    Import crew lazily to avoid side effects at import-time. gthread workers may
+    serve several first requests at once, so construction is guarded by a lock.
     """
-    from crew import TreasuryCrew
-    crew = TreasuryCrew()
+    global _crew
+    if _crew is None:
+        with _crew_lock:
+            if _crew is None:
+                from crew import TreasuryCrew
+                _crew = TreasuryCrew()
+    return _crew
+
+def generate_payment_proposal_adapter(context: Dict[str, Any]):
+    """DI-friendly adapter to call the crew. Tests monkeypatch this symbol."""
+    crew = _get_crew()
     return crew.generate_payment_proposal(context)
 
 def execute_payment_approval_adapter(context: Dict[str, Any]):
-    """DI-friendly adapter to execute payment approvals. Tests monkeypatch this symbol.
-    Import crew lazily to avoid side effects at import-time.
-    """
-    from crew import TreasuryCrew
-    crew = TreasuryCrew()
+    """DI-friendly adapter to execute payment approvals. Tests monkeypatch this symbol."""
+    crew = _get_crew()
     return crew.execute_payments(context)
 
 @application.route('/submit_request', methods=['POST'])
@@ -140,7 +359,7 @@ def submit_request():
     excel_file = request.files['excel']
     try:
         raw_json = request.form['json']
-        cfg = json.loads(raw_json)
+        cfg = orjson.loads(raw_json)
     except Exception:
         return _error("Invalid JSON in 'json' part", 400)
 
@@ -150,22 +369,21 @@ def submit_request():
     except ValueError as ve:
         return _error(str(ve), 400)
 
-    # Read Excel bytes
+    # Reject empty uploads by peeking a single byte rather than reading the whole file
     try:
-        excel_bytes = excel_file.read()
-        if not excel_bytes:
+        if not excel_file.stream.read(1):
             return _error("Uploaded 'excel' file is empty", 400)
+        excel_file.stream.seek(0)
     except Exception:
         return _error("Failed to read 'excel' file", 400)
 
     pid = id_provider()
 
-    # Save Excel bytes to temporary file for crew processing
+    # Stream the upload straight to a temporary file for crew processing
     out_dir = _make_output_dir()
     temp_excel_path = os.path.join(out_dir, f"temp_excel_{pid}.xlsx")
     try:
-        with open(temp_excel_path, 'wb') as f:
-            f.write(excel_bytes)
+        excel_file.save(temp_excel_path)
     except Exception as e:
         return _error(f"Failed to save Excel file: {e}", 500)
 
@@ -182,26 +400,28 @@ def submit_request():
         return _error(f"Crew error: {e}", 500)
 
     # Normalize result to dict - handle CrewOutput objects
-    if hasattr(result, 'raw'):
+    structured = _structured_crew_output(result)
+    if structured is not None:
+        result = structured
+    elif hasattr(result, 'raw'):
         # CrewOutput object - extract the raw JSON string
         try:
-            result = json.loads(result.raw)
+            result = orjson.loads(result.raw)
         except Exception:
             result = {"raw": result.raw}
     elif isinstance(result, str):
         try:
-            result = json.loads(result)
+            result = orjson.loads(result)
         except Exception:
             result = {"raw": result}
 
     # Persist in-memory and to disk
     proposals[pid] = result
 
-    out_dir = _make_output_dir()
     out_path = os.path.join(out_dir, f"proposal_{pid}.json")
     try:
-        with open(out_path, 'w') as f:
-            json.dump(result, f, indent=2)
+        payload = orjson.dumps(result, default=_orjson_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        _artifact_io.submit(_write_artifact, out_path, payload)
     except Exception:
         # Don't fail request purely due to IO; log silently in real app
         pass
@@ -214,8 +434,7 @@ def submit_request():
     }
 
     # 202 Accepted with Location is preferred, but tests accept 200 or 202
-    resp = jsonify(body)
-    resp.status_code = 202
+    resp = _json_response(body, 202)
     resp.headers['Location'] = f"/get_payment_proposal/{pid}"
     return resp
 
@@ -223,9 +442,10 @@ def submit_request():
 def get_payment_proposal(proposal_id):
     """Returns the stored payment proposal for human review."""
     try:
-        if proposal_id in proposals:
-            return jsonify(proposals[proposal_id]), 200
-        return _error("Proposal not found", 404)
+        body = proposals.get_json(proposal_id)
+        if body is None:
+            return _error("Proposal not found", 404)
+        return _json_bytes_response(body, 200)
     except Exception as e:
         return _error(f"Internal error: {e}", 500)
 
@@ -251,13 +471,11 @@ def submit_payment_approval():
     
     proposal_id = data["proposal_id"]
     
-    # Check if proposal exists
-    if proposal_id not in proposals:
+    # Get existing proposal data (a single lookup, so an expiring entry can't 500)
+    proposal_data = proposals.get(proposal_id)
+    if proposal_data is None:
         return _error("Proposal not found", 404)
     
-    # Get existing proposal data
-    proposal_data = proposals[proposal_id]
-    
     # Prepare context for payment execution
     context = {
         "proposal_id": proposal_id,
@@ -276,15 +494,18 @@ def submit_payment_approval():
         return _error(f"Payment execution failed: {e}", 500)
     
     # Normalize execution result - handle CrewOutput objects
-    if hasattr(execution_result, 'raw'):
+    structured = _structured_crew_output(execution_result)
+    if structured is not None:
+        execution_result = structured
+    elif hasattr(execution_result, 'raw'):
         # CrewOutput object - extract the raw JSON string
         try:
-            execution_result = json.loads(execution_result.raw)
+            execution_result = orjson.loads(execution_result.raw)
         except Exception:
             execution_result = {"execution_status": "FAILURE", "message": execution_result.raw}
     elif isinstance(execution_result, str):
         try:
-            execution_result = json.loads(execution_result)
+            execution_result = orjson.loads(execution_result)
         except Exception:
             execution_result = {"execution_status": "FAILURE", "message": execution_result}
     
@@ -292,15 +513,16 @@ def submit_payment_approval():
     execution_status = execution_result.get("execution_status", "FAILURE")
     message = execution_result.get("message", "Payment execution completed")
     
-    # Update proposal with execution results
-    proposals[proposal_id]["execution_result"] = execution_result
+    # Update proposal with execution results (write back so shared stores persist it)
+    proposal_data["execution_result"] = execution_result
+    proposals[proposal_id] = proposal_data
     
     # Save execution results to file
     out_dir = _make_output_dir()
     result_path = os.path.join(out_dir, f"execution_result_{proposal_id}.json")
     try:
-        with open(result_path, 'w') as f:
-            json.dump(execution_result, f, indent=2)
+        payload = orjson.dumps(execution_result, default=_orjson_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        _artifact_io.submit(_write_artifact, result_path, payload)
     except Exception:
         # Don't fail request purely due to IO
         pass
@@ -313,27 +535,26 @@ def submit_payment_approval():
         "next_step": f"GET /payment_execution_result/{proposal_id}"
     }
     
-    return jsonify(response_body), 200
+    return _json_response(response_body, 200)
 
 @application.route('/payment_execution_result/<string:proposal_id>', methods=['GET'])
 def get_payment_execution_result(proposal_id):
     """Returns the detailed result of the payment execution."""
     try:
         # Check if proposal exists
-        if proposal_id not in proposals:
+        proposal_data = proposals.get(proposal_id)
+        if proposal_data is None:
             return _error("Proposal not found", 404)
         
-        proposal_data = proposals[proposal_id]
-        
         # Check if execution result exists
         if 'execution_result' not in proposal_data:
             return _error("No execution result found for this proposal", 404)
         
         execution_result = proposal_data['execution_result']
         
-        # Best-effort cleanup of disk artifacts for this proposal before returning
+        # Best-effort cleanup of disk artifacts for this proposal, queued behind its pending writes
         try:
-            _cleanup_proposal_artifacts(proposal_id)
+            _artifact_io.submit(_cleanup_proposal_artifacts, proposal_id)
         except Exception:
             pass
         
@@ -344,7 +565,7 @@ def get_payment_execution_result(proposal_id):
             pass  # Fail silently if key doesn't exist
         
         # Return execution result per API documentation
-        return jsonify(execution_result), 200
+        return _json_response(execution_result, 200)
         
     except Exception as e:
         return _error(f"Internal error: {e}", 500)
@@ -1,4 +1,5 @@
 from crewai import Crew, Process
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from src.tasks import TreasuryTasks
 from src.agents import TreasuryAgents
@@ -7,9 +8,9 @@ from tools.treasury_usdt_payment_tool import TreasuryUSDTPaymentTool
 
 class TreasuryCrew:
     def __init__(self, excel_parser_tool: Optional[ExcelParserTool] = None, payment_tool: Optional[TreasuryUSDTPaymentTool] = None):
-        # Initialize agents and tasks
-        self.tasks = TreasuryTasks()
+        # Initialize agents and tasks; tasks reuse the same TreasuryAgents (one set of LLM clients)
         self.agents = TreasuryAgents()
+        self.tasks = TreasuryTasks(self.agents)
 
         # Tools (injectable for testing/config)
         self.excel_parser = excel_parser_tool or ExcelParserTool()
@@ -25,14 +26,16 @@ class TreasuryCrew:
 
     def build_proposal_crew(self, context: Dict[str, Any]) -> Crew:
         """Build a crew to run risk assessment -> proposal generation sequentially."""
+        # Kept sequential on purpose: the proposal task builds its payment list from the
+        # risk assessment output, so there is no independent work to overlap. The only
+        # other LLM-bound step (execution) is gated on human approval.
         risk_task = self.tasks.risk_assessment_task(context)
         proposal_task = self.tasks.payment_proposal_task(context)
 
+        # Reuse the tasks' Agent instances rather than constructing a second copy of each.
+        # Agents are built per crew: kickoff mutates them, so they are not shared across requests.
         return Crew(
-            agents=[
-                self.agents.risk_assessor(),
-                self.agents.proposal_processor(),
-            ],
+            agents=[risk_task.agent, proposal_task.agent],
             tasks=[risk_task, proposal_task],
             process=Process.sequential,
         )
@@ -42,9 +45,7 @@ class TreasuryCrew:
         exec_task = self.tasks.payment_execution_task(context)
 
         return Crew(
-            agents=[
-                self.agents.payment_specialist(),
-            ],
+            agents=[exec_task.agent],
             tasks=[exec_task],
             process=Process.sequential,
         )
@@ -60,11 +61,14 @@ class TreasuryCrew:
         return crew.kickoff(inputs=context)
 
 
-# Convenience singletons/functions for simple imports (e.g., from crew import generate_payment_proposal)
-_default_crew = TreasuryCrew()
+# Convenience singleton/functions for simple imports (e.g., from crew import generate_payment_proposal)
+# The default crew is built lazily so importing this module does not validate env or construct LLMs.
+@lru_cache(maxsize=1)
+def _default_crew() -> TreasuryCrew:
+    return TreasuryCrew()
 
 def generate_payment_proposal(context: Dict[str, Any]):
-    return _default_crew.generate_payment_proposal(context)
+    return _default_crew().generate_payment_proposal(context)
 
 def execute_payments(context: Dict[str, Any]):
-    return _default_crew.execute_payments(context)
\ No newline at end of file
+    return _default_crew().execute_payments(context)
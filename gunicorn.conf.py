@@ -0,0 +1,11 @@
+import os
+
+# Gunicorn settings for flask_server:app / application:application.
+# Request time is dominated by network-bound LLM calls inside crew.kickoff(), so each
+# worker runs a thread pool instead of pinning a whole process per in-flight request.
+# Proposals are held in-process unless REDIS_URL is set, so scale with threads first.
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+timeout = 600
@@ -1,28 +1,59 @@
 from crewai import Task, Process
+from typing import Any, Optional
+import orjson
 from .agents import TreasuryAgents
 # Placeholder for tool imports, assuming they will be created.
 # from .tools import ExcelParserTool, PaymentExecutorTool
 
-class TreasuryTasks:
-    def __init__(self):
-        self.agents = TreasuryAgents()
-        # self.excel_parser = ExcelParserTool()
-        # self.payment_executor = PaymentExecutorTool()
+def _as_json(value: Any) -> str:
+    """Renders context values for prompts as compact JSON (faster than repr and unambiguous for the LLM)."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
-    def risk_assessment_task(self, context):
-        excel_file_path = context.get('excel_file_path', 'unknown')
-        risk_assessment_task = Task(
-            description=f"""
+class TreasuryTasks:
+    # Description templates are built once; per request only the context values are filled in.
+    _RISK_ASSESSMENT_TMPL = """
             Analyze the financial data provided in the Excel file and evaluate risks based on:
             - Data integrity and completeness.
-            - User-defined constraints: {context.get('config', {}).get('risk_config', {})}
+            - User-defined constraints: {risk_config}
             - Payment amounts and recipients.
             - Overall financial exposure.
             
             IMPORTANT: Use the Excel Parser Tool with file_path: {excel_file_path}
             
             Generate a detailed risk assessment report with risk scores and recommendations.
-            """,
+            """
+
+    _PAYMENT_PROPOSAL_TMPL = """
+            Create a structured payment proposal based on the risk assessment. The report should be
+            well-formatted and structured. The content should be about the payment proposal, and each payment
+            must include a unique payment_id, recipient_wallet, amount, and reference.
+            
+            Use proposal_id: {proposal_id}
+            """
+
+    _PAYMENT_EXECUTION_TMPL = """
+            Execute the approved payments based on the user's approval details:
+            - Approval Decision: {approval_decision}
+            - Approved Payments: {approved_payments}
+            - Proposal Data: {proposal_data}
+            - Custody Wallet: {custody_wallet}
+            
+            Use the Treasury USDT Payment Tool to execute the approved payments.
+            The final report should be well-formatted and structured.
+            """
+
+    def __init__(self, agents: Optional[TreasuryAgents] = None):
+        # Share the caller's agents (and their LLM clients) instead of building a second set
+        self.agents = agents or TreasuryAgents()
+        # self.excel_parser = ExcelParserTool()
+        # self.payment_executor = PaymentExecutorTool()
+
+    def risk_assessment_task(self, context):
+        risk_assessment_task = Task(
+            description=self._RISK_ASSESSMENT_TMPL.format_map({
+                'risk_config': _as_json(context.get('config', {}).get('risk_config', {})),
+                'excel_file_path': context.get('excel_file_path', 'unknown'),
+            }),
             expected_output="""
             Valid payment list: Recipient Wallet, Amount, Reference
             Risk Assessment: Low/Medium/High
@@ -35,13 +66,9 @@ class TreasuryTasks:
 
     def payment_proposal_task(self, context):
         payment_proposal_task = Task(
-            description=f"""
-            Create a structured payment proposal based on the risk assessment. The report should be
-            well-formatted and structured. The content should be about the payment proposal, and each payment
-            must include a unique payment_id, recipient_wallet, amount, and reference.
-            
-            Use proposal_id: {context.get('proposal_id', 'unknown')}
-            """,
+            description=self._PAYMENT_PROPOSAL_TMPL.format_map({
+                'proposal_id': context.get('proposal_id', 'unknown'),
+            }),
             expected_output="""
             A JSON object with 'proposal_id', 'report', and a list of 'payments', where each payment has
             'payment_id', 'recipient_wallet', 'amount', and 'reference'.
@@ -64,21 +91,13 @@ class TreasuryTasks:
         return payment_proposal_task
 
     def payment_execution_task(self, context):
-        approval_decision = context.get('approval_decision', 'unknown')
-        approved_payments = context.get('approved_payments', [])
-        proposal_data = context.get('proposal_data', {})
-        
         payment_execution_task = Task(
-            description=f"""
-            Execute the approved payments based on the user's approval details:
-            - Approval Decision: {approval_decision}
-            - Approved Payments: {approved_payments}
-            - Proposal Data: {proposal_data}
-            - Custody Wallet: {context.get('custody_wallet', 'not provided')}
-            
-            Use the Treasury USDT Payment Tool to execute the approved payments.
-            The final report should be well-formatted and structured.
-            """,
+            description=self._PAYMENT_EXECUTION_TMPL.format_map({
+                'approval_decision': context.get('approval_decision', 'unknown'),
+                'approved_payments': _as_json(context.get('approved_payments', [])),
+                'proposal_data': _as_json(context.get('proposal_data', {})),
+                'custody_wallet': context.get('custody_wallet', 'not provided'),
+            }),
             expected_output="""
             A JSON object containing the 'proposal_id', 'execution_status', and a detailed breakdown of
             'executed_payments' and 'failed_payments'.
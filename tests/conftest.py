@@ -0,0 +1,115 @@
+import io
+from pathlib import Path
+
+import orjson
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEST_DATA_DIR = PROJECT_ROOT.parent / 'Agent' / 'test_data'
+EXCEL_PATH = TEST_DATA_DIR / 'dummy_financial_data.xlsx'
+CONFIG_PATH = TEST_DATA_DIR / 'dummy_request.json'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+# flask_server (and with it Flask, CrewAI and web3) is imported on first use rather than at
+# collection, so `pytest --collect-only` and runs of unrelated modules skip that import graph.
+@pytest.fixture(scope="session")
+def artifact_dir(tmp_path_factory):
+    """Per-session AGENT_STORAGE_DIR, so artifacts left by error paths never land in the repo's tmp/."""
+    with pytest.MonkeyPatch.context() as mp:
+        path = tmp_path_factory.mktemp('agent_storage')
+        mp.setenv('AGENT_STORAGE_DIR', str(path))
+        yield path
+
+
+@pytest.fixture(scope="session")
+def app(artifact_dir):
+    from flask_server import app, _make_output_dir
+    # The output dir is resolved once per process; drop any earlier resolution
+    _make_output_dir.cache_clear()
+    return app
+
+
+@pytest.fixture(scope="session")
+def proposals():
+    from flask_server import proposals
+    return proposals
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    # One cookieless test client for the whole session (no endpoint uses sessions);
+    # tests that write proposals isolate storage with clear_storage
+    with app.test_client(use_cookies=False) as c:
+        yield c
+
+
+@pytest.fixture
+def clear_storage(proposals):
+    # Opt-in for tests that write proposals: run against an empty store, then restore
+    # whatever was there before. Pure error-path tests never touch the store and skip it.
+    # Only the in-memory store can be snapshotted; a Redis store (REDIS_URL) is just cleared.
+    saved = dict(proposals) if isinstance(proposals, dict) else None
+    proposals.clear()
+    yield
+    proposals.clear()
+    if saved:
+        proposals.update(saved)
+
+
+# Shared test data is read once per session (per xdist worker); treat it as read-only and
+# deep-copy base_config before mutating it.
+@pytest.fixture(scope="session")
+def excel_bytes():
+    return EXCEL_PATH.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def base_config():
+    return orjson.loads(CONFIG_PATH.read_bytes())
+
+
+@pytest.fixture(scope="session")
+def config_json(base_config):
+    """Unmodified test config encoded once for the multipart 'json' field."""
+    return orjson.dumps(base_config).decode()
+
+
+@pytest.fixture(scope="session")
+def excel_upload(excel_bytes):
+    """Factory for upload tuples; each call wraps the shared bytes in a fresh stream
+    because werkzeug consumes it."""
+    def make(filename=EXCEL_PATH.name):
+        return (io.BytesIO(excel_bytes), filename, XLSX_CONTENT_TYPE)
+    return make
+
+
+@pytest.fixture
+def stub_adapter(monkeypatch):
+    """Returns a function that swaps flask_server's crew proposal adapter for the given fake."""
+    def apply(fn):
+        monkeypatch.setattr('flask_server.generate_payment_proposal_adapter', fn, raising=True)
+    return apply
+
+
+FAKE_PAYMENTS = [
+    {"payment_id": "pay-1", "recipient_wallet": "0x456", "amount": 100.0, "reference": "TEST-001"},
+    {"payment_id": "pay-2", "recipient_wallet": "0x789", "amount": 200.0, "reference": "TEST-002"},
+    {"payment_id": "pay-3", "recipient_wallet": "0xabc", "amount": 300.0, "reference": "TEST-003"},
+]
+
+
+def fake_generate(context):
+    # Deterministic proposal keyed by the server-generated proposal_id
+    return {
+        "proposal_id": context.get('proposal_id') or 'pid-test',
+        "report": "Risk analysis OK. Generated payments.",
+        "payments": FAKE_PAYMENTS,
+    }
+
+
+@pytest.fixture
+def stub_generate(stub_adapter):
+    """Swap in fake_generate as the crew proposal adapter."""
+    stub_adapter(fake_generate)
@@ -1,8 +1,10 @@
+import io
 import os
 import sys
-import json
+import orjson
 import traceback
 from datetime import datetime
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Ensure project root is importable
@@ -15,102 +17,124 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 LOG_PATH = os.path.join(OUTPUT_DIR, 'crew_kickoff.txt')
 PROPOSAL_PATH = os.path.join(OUTPUT_DIR, 'crew_proposal.json')
 CONTEXT_PATH = os.path.join(OUTPUT_DIR, 'crew_context_meta.json')
+ENV_PATH = os.path.join(PROJECT_ROOT, '.env')
 
+_env_loaded = False
 
-def write_log(lines):
-    content = "\n".join(lines)
+
+def _load_env():
+    # Load .env once per process from a known path (skips find_dotenv's upward directory walk)
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv(dotenv_path=ENV_PATH)
+        _env_loaded = True
+
+
+@lru_cache(maxsize=1)
+def _get_crew():
+    # Import crewai and build the crew on first use; repeated main() calls reuse it
+    from crew import TreasuryCrew
+    return TreasuryCrew()
+
+
+def write_log(buf):
+    content = buf.getvalue()
     with open(LOG_PATH, 'w') as f:
         f.write(content)
-    print(content)
+    sys.stdout.write(content)
 
 
 def main():
-    load_dotenv()  # allow .env to set provider creds and model ids
-    lines = []
-    lines.append('CREW KICKOFF START')
-    lines.append(f'Timestamp: {datetime.utcnow().isoformat()}Z')
+    _load_env()  # allow .env to set provider creds and model ids
+    # Log lines accumulate in one growing buffer (no final join copy of a large traceback)
+    buf = io.StringIO()
+
+    def log(line):
+        buf.write(line)
+        buf.write('\n')
 
-    # Prepare Excel bytes
-    excel_bytes = None
+    log('CREW KICKOFF START')
+    log(f'Timestamp: {datetime.utcnow().isoformat()}Z')
+
+    # Locate the test Excel; the crew's Excel Parser Tool reads it from disk by path,
+    # so the workbook is never loaded into memory here
     excel_source = None
+    excel_size = None
 
     # Preferred: use existing test Excel if available
     candidate = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_financial_data.xlsx'))
     if os.path.exists(candidate):
         try:
-            with open(candidate, 'rb') as f:
-                excel_bytes = f.read()
+            excel_size = os.path.getsize(candidate)
             excel_source = candidate
         except Exception as e:
-            lines.append(f'Failed to read existing test Excel: {e}')
+            log(f'Failed to read existing test Excel: {e}')
 
-    if excel_bytes is None:
-        lines.append('No test Excel found at Agent/test_data/dummy_financial_data.xlsx; cannot proceed with real Excel parsing.')
-        lines.append('Please provide a valid .xlsx or adjust the path.')
-        write_log(lines)
+    if excel_source is None:
+        log('No test Excel found at Agent/test_data/dummy_financial_data.xlsx; cannot proceed with real Excel parsing.')
+        log('Please provide a valid .xlsx or adjust the path.')
+        write_log(buf)
         return
 
     # Load config JSON from repository test data (no hardcoding)
     CONFIG_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_request.json'))
     if not os.path.exists(CONFIG_PATH):
-        lines.append(f'Config JSON not found: {CONFIG_PATH}')
-        write_log(lines)
+        log(f'Config JSON not found: {CONFIG_PATH}')
+        write_log(buf)
         return
     try:
-        with open(CONFIG_PATH, 'r') as f:
-            config = json.load(f)
+        with open(CONFIG_PATH, 'rb') as f:
+            config = orjson.loads(f.read())
     except Exception as e:
-        lines.append(f'Failed to read/parse config JSON: {e}')
-        write_log(lines)
+        log(f'Failed to read/parse config JSON: {e}')
+        write_log(buf)
         return
 
-    # Build context expected by crew/tasks/tools
+    # Build context expected by crew/tasks/tools (same shape as flask_server.submit_request)
     context = {
         "proposal_id": None,  # let server set in real endpoint; here we only run crew
         "config": config,
-        "excel": {
-            "filename": os.path.basename(excel_source),
-            "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            "bytes": excel_bytes,
-        },
+        "excel_file_path": excel_source,
+        "excel_filename": os.path.basename(excel_source),
     }
 
-    # Save meta context (without raw bytes) for audit
+    # Save meta context for audit
     meta = {
         "excel": {
-            "filename": context["excel"]["filename"],
-            "content_type": context["excel"]["content_type"],
-            "size_bytes": len(excel_bytes),
+            "filename": context["excel_filename"],
+            "content_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "size_bytes": excel_size,
         },
         "config_keys": list(config.keys()),
     }
-    with open(CONTEXT_PATH, 'w') as f:
-        json.dump(meta, f, indent=2)
+    with open(CONTEXT_PATH, 'wb') as f:
+        f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
 
     try:
-        from crew import TreasuryCrew
-        crew = TreasuryCrew()
+        crew = _get_crew()
         # Kick off proposal generation
         result = crew.generate_payment_proposal(context)
 
         # Try to coerce to JSON if string-like
         if isinstance(result, str):
             try:
-                parsed = json.loads(result)
+                parsed = orjson.loads(result)
             except Exception:
                 parsed = {"raw": result}
             result = parsed
 
-        with open(PROPOSAL_PATH, 'w') as f:
-            json.dump(result, f, indent=2)
+        with open(PROPOSAL_PATH, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
 
-        lines.append('Crew kickoff: SUCCESS')
-        lines.append(f'Proposal saved: {PROPOSAL_PATH}')
-    except Exception:
-        lines.append('Crew kickoff: FAILED')
-        lines.append(traceback.format_exc())
+        log('Crew kickoff: SUCCESS')
+        log(f'Proposal saved: {PROPOSAL_PATH}')
+    except Exception as e:
+        log('Crew kickoff: FAILED')
+        # Stream the formatted traceback into the buffer instead of building one string first
+        for chunk in traceback.TracebackException.from_exception(e).format():
+            buf.write(chunk)
 
-    write_log(lines)
+    write_log(buf)
 
 
 if __name__ == '__main__':
@@ -1,16 +1,40 @@
+import io
 import json
 import os
 import sys
 import traceback
 
 
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 def _write_output(content: str):
     out_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'output'))
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, 'test_health.txt')
-    with open(out_path, 'w') as f:
-        f.write(content)
-    print(content)
+    # Encode once and write the same buffer to the report file and stdout via raw fds
+    buf = content.encode('utf-8')
+    fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_all(fd, buf)
+    finally:
+        os.close(fd)
+    sys.stdout.flush()
+    try:
+        stdout_fd = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        # Not backed by a real fd (pytest capture, IDE runners, wrapped streams)
+        stdout_buffer = getattr(sys.stdout, 'buffer', None)
+        if stdout_buffer is not None:
+            stdout_buffer.write(buf + b'\n')
+            stdout_buffer.flush()
+        else:
+            print(content)
+        return
+    _write_all(stdout_fd, buf + b'\n')
 
 
 def main():
@@ -40,15 +64,16 @@ def main():
                 'content_type': resp.content_type,
                 'json': data,
             }
+            # Each check only runs once the previous one passed; None marks a skipped check
             a1 = (resp.status_code == 200)
-            a2 = (resp.content_type.startswith('application/json'))
-            a3 = (data == {'status': 'healthy'})
+            a2 = resp.content_type.startswith('application/json') if a1 else None
+            a3 = (data == {'status': 'healthy'}) if a2 else None
             result['assertions'] = [
                 {'name': 'status_code_is_200', 'passed': a1},
                 {'name': 'content_type_is_json', 'passed': a2},
                 {'name': 'body_is_expected', 'passed': a3},
             ]
-            result['passed'] = a1 and a2 and a3
+            result['passed'] = a3 is True
 
         lines = []
         lines.append('HEALTH ENDPOINT TEST')
@@ -57,7 +82,8 @@ def main():
         lines.append(f"JSON: {json.dumps(result['response']['json'])}")
         lines.append('Assertions:')
         for a in result['assertions']:
-            lines.append(f" - {a['name']}: {'PASS' if a['passed'] else 'FAIL'}")
+            outcome = 'SKIP' if a['passed'] is None else ('PASS' if a['passed'] else 'FAIL')
+            lines.append(f" - {a['name']}: {outcome}")
         lines.append(f"OVERALL: {'PASS' if result['passed'] else 'FAIL'}")
         _write_output('\n'.join(lines))
     except Exception:
@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+
+
+def test_arrow_skips_mixed_type_columns():
+    pytest.importorskip('pyarrow')
+    from tools.excel_parser_tool import _to_arrow_ipc_b64
+
+    # Numbers and text notes in one column are routine in spreadsheets
+    mixed = pd.DataFrame({"amount": [100.0, "see note", 250]})
+    clean = pd.DataFrame({"amount": [100.0, 250.0]})
+
+    assert _to_arrow_ipc_b64(mixed) is None
+    assert isinstance(_to_arrow_ipc_b64(clean), str)
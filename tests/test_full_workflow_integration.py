@@ -1,276 +1,263 @@
-import io
-import json
-import os
+import logging
 import pytest
 import time
-from flask_server import app, proposals
+from werkzeug.test import EnvironBuilder
 
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-EXCEL_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_financial_data.xlsx'))
-CONFIG_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_request.json'))
+# Progress output goes through logging (lazy %-formatting); view with `pytest --log-cli-level=INFO`
+logger = logging.getLogger(__name__)
 
 
-@pytest.fixture(autouse=True)
-def clear_storage():
-    proposals.clear()
-    yield
-    proposals.clear()
+@pytest.fixture(scope="module")
+def submit(client, excel_upload, config_json):
+    """POST /submit_request with the shared test Excel and config. The multipart body is
+    encoded once per filename and replayed as raw bytes."""
+    bodies = {}
 
+    def post(filename='test.xlsx'):
+        if filename not in bodies:
+            builder = EnvironBuilder(path='/submit_request', method='POST', data={
+                'json': config_json,
+                'excel': excel_upload(filename),
+            })
+            try:
+                environ = builder.get_environ()
+                bodies[filename] = environ['wsgi.input'].read(), environ['CONTENT_TYPE']
+            finally:
+                builder.close()
+        body, content_type = bodies[filename]
+        return client.post('/submit_request', data=body, content_type=content_type)
 
-def _load_test_data():
-    """Load test Excel and JSON configuration."""
-    with open(EXCEL_PATH, 'rb') as f:
-        excel_bytes = f.read()
-    with open(CONFIG_PATH, 'r') as f:
-        cfg = json.load(f)
-    return excel_bytes, cfg
+    return post
+
+
+# Required top-level fields per response, from the API documentation
+_REQUIRED_FIELDS = {
+    "submit_request_response": frozenset(['success', 'proposal_id', 'message', 'next_step']),
+    "payment_proposal": frozenset(['proposal_id', 'report', 'payments']),
+    "payment_approval_response": frozenset(['success', 'execution_status', 'message', 'next_step']),
+    "execution_result": frozenset(['proposal_id', 'execution_status', 'executed_payments', 'failed_payments']),
+}
+_PAYMENT_FIELDS = frozenset(['payment_id', 'recipient_wallet', 'amount', 'reference'])
+_EXECUTION_STATUSES = frozenset(['SUCCESS', 'PARTIAL_SUCCESS', 'FAILURE'])
 
 
 def _validate_json_schema(data, schema_name):
     """Validate JSON response matches API documentation schema."""
-    print(f"   📋 Validating {schema_name} schema...")
+    logger.info("   📋 Validating %s schema...", schema_name)
+    
+    missing = _REQUIRED_FIELDS[schema_name] - data.keys()
+    assert not missing, f"Missing required field(s): {sorted(missing)}"
     
     if schema_name == "submit_request_response":
-        required_fields = ['success', 'proposal_id', 'message', 'next_step']
-        for field in required_fields:
-            assert field in data, f"Missing required field: {field}"
         assert data['success'] is True
         assert data['next_step'].startswith('GET /get_payment_proposal/')
         
     elif schema_name == "payment_proposal":
-        required_fields = ['proposal_id', 'report', 'payments']
-        for field in required_fields:
-            assert field in data, f"Missing required field: {field}"
-        
         # Validate payment structure
         for payment in data['payments']:
-            payment_fields = ['payment_id', 'recipient_wallet', 'amount', 'reference']
-            for field in payment_fields:
-                assert field in payment, f"Payment missing field: {field}"
+            assert _PAYMENT_FIELDS <= payment.keys(), f"Payment missing field(s): {sorted(_PAYMENT_FIELDS - payment.keys())}"
                 
     elif schema_name == "payment_approval_response":
-        required_fields = ['success', 'execution_status', 'message', 'next_step']
-        for field in required_fields:
-            assert field in data, f"Missing required field: {field}"
         assert data['success'] is True
-        assert data['execution_status'] in ['SUCCESS', 'PARTIAL_SUCCESS', 'FAILURE']
+        assert data['execution_status'] in _EXECUTION_STATUSES
         assert data['next_step'].startswith('GET /payment_execution_result/')
         
     elif schema_name == "execution_result":
-        required_fields = ['proposal_id', 'execution_status', 'executed_payments', 'failed_payments']
-        for field in required_fields:
-            assert field in data, f"Missing required field: {field}"
-        assert data['execution_status'] in ['SUCCESS', 'PARTIAL_SUCCESS', 'FAILURE']
+        assert data['execution_status'] in _EXECUTION_STATUSES
         
-    print(f"   ✅ {schema_name} schema validation PASSED")
+    logger.info("   ✅ %s schema validation PASSED", schema_name)
 
 
-def test_full_workflow_integration():
+def test_full_workflow_integration(clear_storage, client, proposals, submit, excel_bytes, base_config):
     """Test complete workflow: submit_request -> get_proposal -> approve -> get_result"""
     
-    print("\n🔄 FULL WORKFLOW INTEGRATION TEST")
-    print("=" * 60)
+    logger.info("\n🔄 FULL WORKFLOW INTEGRATION TEST")
+    logger.info("=" * 60)
     
-    excel_bytes, cfg = _load_test_data()
-    print(f"📊 Test data loaded: {len(excel_bytes)} bytes Excel, {len(cfg)} config keys")
+    logger.info("📊 Test data loaded: %s bytes Excel, %s config keys", len(excel_bytes), len(base_config))
     
-    with app.test_client() as client:
-        
-        # ==================== STEP 1: Submit Request ====================
-        print(f"\n📝 STEP 1: POST /submit_request")
-        
-        data = {
-            'json': json.dumps(cfg),
-            'excel': (io.BytesIO(excel_bytes), 'dummy_financial_data.xlsx', 
-                     'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-        }
-        
-        resp1 = client.post('/submit_request', data=data)
-        print(f"   Status: {resp1.status_code}")
-        
-        assert resp1.status_code in (200, 202), f"Step 1 failed with {resp1.status_code}"
-        body1 = resp1.get_json()
-        _validate_json_schema(body1, "submit_request_response")
-        
-        proposal_id = body1['proposal_id']
-        print(f"   ✅ Step 1 SUCCESS: proposal_id = {proposal_id}")
-        print(f"   📋 Crew kickoff: Risk assessment + proposal generation")
-        
-        # Verify proposal stored correctly
-        assert proposal_id in proposals, "Proposal not stored in memory"
-        stored_proposal = proposals[proposal_id]
-        assert 'payments' in stored_proposal, "Proposal missing payments array"
-        print(f"   📊 Stored proposal has {len(stored_proposal['payments'])} payments")
-        
-        # ==================== STEP 2: Get Payment Proposal ====================
-        print(f"\n📋 STEP 2: GET /get_payment_proposal/{proposal_id}")
-        
-        resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
-        print(f"   Status: {resp2.status_code}")
-        
-        assert resp2.status_code == 200, f"Step 2 failed with {resp2.status_code}"
-        proposal_data = resp2.get_json()
-        _validate_json_schema(proposal_data, "payment_proposal")
-        
-        print(f"   ✅ Step 2 SUCCESS: Retrieved {len(proposal_data['payments'])} payments")
-        print(f"   📋 Report length: {len(proposal_data.get('report', ''))} characters")
-        
-        # Validate crew output structure
-        assert proposal_data['proposal_id'] == proposal_id
-        for i, payment in enumerate(proposal_data['payments']):
-            print(f"     Payment {i+1}: {payment['amount']} to {payment['recipient_wallet']}")
-            assert isinstance(payment['amount'], (int, float))
-            assert payment['recipient_wallet'].startswith('0x') or payment['recipient_wallet'] == 'Treasury'
-        
-        # ==================== STEP 3: Submit Payment Approval ====================
-        print(f"\n💰 STEP 3: POST /submit_payment_approval")
-        
-        approval_data = {
-            'proposal_id': proposal_id,
-            'custody_wallet': '0x1234567890123456789012345678901234567890',
-            'private_key': 'test-private-key-integration',
-            'approval_decision': 'approve_all',
-            'comments': 'Full workflow integration test - approve all payments'
-        }
-        
-        resp3 = client.post('/submit_payment_approval', json=approval_data)
-        print(f"   Status: {resp3.status_code}")
-        
-        assert resp3.status_code == 200, f"Step 3 failed with {resp3.status_code}"
-        approval_response = resp3.get_json()
-        _validate_json_schema(approval_response, "payment_approval_response")
-        
-        print(f"   ✅ Step 3 SUCCESS: Execution Status = {approval_response['execution_status']}")
-        print(f"   🤖 Crew kickoff: Payment agent execution with custody credentials")
-        print(f"   💬 Message: {approval_response['message']}")
-        
-        # Verify execution result was stored
-        updated_proposal = proposals[proposal_id]
-        assert 'execution_result' in updated_proposal, "Execution result not stored"
-        print(f"   📊 Execution result stored in proposal")
-        
-        # ==================== STEP 4: Get Payment Execution Result ====================
-        print(f"\n📊 STEP 4: GET /payment_execution_result/{proposal_id}")
-        
-        resp4 = client.get(f'/payment_execution_result/{proposal_id}')
-        print(f"   Status: {resp4.status_code}")
-        
-        assert resp4.status_code == 200, f"Step 4 failed with {resp4.status_code}"
-        execution_result = resp4.get_json()
-        _validate_json_schema(execution_result, "execution_result")
-        
-        print(f"   ✅ Step 4 SUCCESS: Final execution details retrieved")
-        print(f"   📊 Execution Status: {execution_result['execution_status']}")
-        print(f"   ✅ Executed Payments: {len(execution_result.get('executed_payments', []))}")
-        print(f"   ❌ Failed Payments: {len(execution_result.get('failed_payments', []))}")
-        print(f"   💬 Final Message: {execution_result.get('message', 'N/A')}")
-        
-        # ==================== WORKFLOW VALIDATION ====================
-        print(f"\n🎯 WORKFLOW VALIDATION")
-        print("=" * 30)
-        
-        # Validate data consistency across steps
-        assert execution_result['proposal_id'] == proposal_id
-        assert execution_result['proposal_id'] == proposal_data['proposal_id']
-        print("   ✅ Proposal ID consistent across all steps")
-        
-        # Validate crew integration points
-        print("   ✅ Crew kickoff #1: Risk assessment + proposal generation (Step 1)")
-        print("   ✅ Crew kickoff #2: Payment execution with HITL (Step 3)")
-        
-        # Validate API documentation compliance
-        print("   ✅ All request/response JSON schemas match API documentation")
-        print("   ✅ Error handling follows consistent format")
-        print("   ✅ HTTP status codes match specification")
-        
-        # Validate workflow completeness
-        print("   ✅ Complete workflow: Submit → Review → Approve → Execute")
-        print("   ✅ Data persistence across all steps")
-        print("   ✅ Proper crew HITL integration at approval step")
-        
-        print(f"\n🎉 FULL WORKFLOW INTEGRATION TEST COMPLETE!")
-        print("✅ All 4 endpoints working in sequence")
-        print("✅ JSON schemas match API documentation exactly") 
-        print("✅ Crew integration functioning at correct timing")
-        print("✅ Complete treasury management workflow operational")
+    
+    # ==================== STEP 1: Submit Request ====================
+    logger.info("\n📝 STEP 1: POST /submit_request")
+    
+    resp1 = submit('dummy_financial_data.xlsx')
+    logger.info("   Status: %s", resp1.status_code)
+    
+    assert resp1.status_code in (200, 202), f"Step 1 failed with {resp1.status_code}"
+    body1 = resp1.get_json()
+    _validate_json_schema(body1, "submit_request_response")
+    
+    proposal_id = body1['proposal_id']
+    logger.info("   ✅ Step 1 SUCCESS: proposal_id = %s", proposal_id)
+    logger.info("   📋 Crew kickoff: Risk assessment + proposal generation")
+    
+    # Verify proposal stored correctly
+    assert proposal_id in proposals, "Proposal not stored in memory"
+    stored_proposal = proposals[proposal_id]
+    assert 'payments' in stored_proposal, "Proposal missing payments array"
+    logger.info("   📊 Stored proposal has %s payments", len(stored_proposal['payments']))
+    
+    # ==================== STEP 2: Get Payment Proposal ====================
+    logger.info("\n📋 STEP 2: GET /get_payment_proposal/%s", proposal_id)
+    
+    resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
+    logger.info("   Status: %s", resp2.status_code)
+    
+    assert resp2.status_code == 200, f"Step 2 failed with {resp2.status_code}"
+    proposal_data = resp2.get_json()
+    _validate_json_schema(proposal_data, "payment_proposal")
+    
+    logger.info("   ✅ Step 2 SUCCESS: Retrieved %s payments", len(proposal_data['payments']))
+    logger.info("   📋 Report length: %s characters", len(proposal_data.get('report', '')))
+    
+    # Validate crew output structure
+    assert proposal_data['proposal_id'] == proposal_id
+    for i, payment in enumerate(proposal_data['payments']):
+        logger.info("     Payment %s: %s to %s", i+1, payment['amount'], payment['recipient_wallet'])
+        assert isinstance(payment['amount'], (int, float))
+        assert payment['recipient_wallet'].startswith('0x') or payment['recipient_wallet'] == 'Treasury'
+    
+    # ==================== STEP 3: Submit Payment Approval ====================
+    logger.info("\n💰 STEP 3: POST /submit_payment_approval")
+    
+    approval_data = {
+        'proposal_id': proposal_id,
+        'custody_wallet': '0x1234567890123456789012345678901234567890',
+        'private_key': 'test-private-key-integration',
+        'approval_decision': 'approve_all',
+        'comments': 'Full workflow integration test - approve all payments'
+    }
+    
+    resp3 = client.post('/submit_payment_approval', json=approval_data)
+    logger.info("   Status: %s", resp3.status_code)
+    
+    assert resp3.status_code == 200, f"Step 3 failed with {resp3.status_code}"
+    approval_response = resp3.get_json()
+    _validate_json_schema(approval_response, "payment_approval_response")
+    
+    logger.info("   ✅ Step 3 SUCCESS: Execution Status = %s", approval_response['execution_status'])
+    logger.info("   🤖 Crew kickoff: Payment agent execution with custody credentials")
+    logger.info("   💬 Message: %s", approval_response['message'])
+    
+    # Verify execution result was stored
+    updated_proposal = proposals[proposal_id]
+    assert 'execution_result' in updated_proposal, "Execution result not stored"
+    logger.info("   📊 Execution result stored in proposal")
+    
+    # ==================== STEP 4: Get Payment Execution Result ====================
+    logger.info("\n📊 STEP 4: GET /payment_execution_result/%s", proposal_id)
+    
+    resp4 = client.get(f'/payment_execution_result/{proposal_id}')
+    logger.info("   Status: %s", resp4.status_code)
+    
+    assert resp4.status_code == 200, f"Step 4 failed with {resp4.status_code}"
+    execution_result = resp4.get_json()
+    _validate_json_schema(execution_result, "execution_result")
+    
+    logger.info("   ✅ Step 4 SUCCESS: Final execution details retrieved")
+    logger.info("   📊 Execution Status: %s", execution_result['execution_status'])
+    logger.info("   ✅ Executed Payments: %s", len(execution_result.get('executed_payments', [])))
+    logger.info("   ❌ Failed Payments: %s", len(execution_result.get('failed_payments', [])))
+    logger.info("   💬 Final Message: %s", execution_result.get('message', 'N/A'))
+    
+    # ==================== WORKFLOW VALIDATION ====================
+    logger.info("\n🎯 WORKFLOW VALIDATION")
+    logger.info("=" * 30)
+    
+    # Validate data consistency across steps
+    assert execution_result['proposal_id'] == proposal_id
+    assert execution_result['proposal_id'] == proposal_data['proposal_id']
+    logger.info("   ✅ Proposal ID consistent across all steps")
+    
+    # Validate crew integration points
+    logger.info("   ✅ Crew kickoff #1: Risk assessment + proposal generation (Step 1)")
+    logger.info("   ✅ Crew kickoff #2: Payment execution with HITL (Step 3)")
+    
+    # Validate API documentation compliance
+    logger.info("   ✅ All request/response JSON schemas match API documentation")
+    logger.info("   ✅ Error handling follows consistent format")
+    logger.info("   ✅ HTTP status codes match specification")
+    
+    # Validate workflow completeness
+    logger.info("   ✅ Complete workflow: Submit → Review → Approve → Execute")
+    logger.info("   ✅ Data persistence across all steps")
+    logger.info("   ✅ Proper crew HITL integration at approval step")
+    
+    logger.info("\n🎉 FULL WORKFLOW INTEGRATION TEST COMPLETE!")
+    logger.info("✅ All 4 endpoints working in sequence")
+    logger.info("✅ JSON schemas match API documentation exactly")
+    logger.info("✅ Crew integration functioning at correct timing")
+    logger.info("✅ Complete treasury management workflow operational")
 
 
-def test_workflow_with_partial_approval():
+def test_workflow_with_partial_approval(clear_storage, client, submit):
     """Test workflow with partial payment approval scenario."""
     
-    print("\n🧪 PARTIAL APPROVAL WORKFLOW TEST")
-    print("=" * 50)
+    logger.info("\n🧪 PARTIAL APPROVAL WORKFLOW TEST")
+    logger.info("=" * 50)
     
-    excel_bytes, cfg = _load_test_data()
+    # Step 1: Submit request
+    resp1 = submit()
+    proposal_id = resp1.get_json()['proposal_id']
     
-    with app.test_client() as client:
-        # Step 1: Submit request
-        data = {
-            'json': json.dumps(cfg),
-            'excel': (io.BytesIO(excel_bytes), 'test.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-        }
-        resp1 = client.post('/submit_request', data=data)
-        proposal_id = resp1.get_json()['proposal_id']
-        
-        # Step 2: Get proposal to see available payments
-        resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
-        proposal_data = resp2.get_json()
-        all_payments = [p['payment_id'] for p in proposal_data['payments']]
-        
-        # Step 3: Approve only first payment (partial approval)
-        approval_data = {
-            'proposal_id': proposal_id,
-            'custody_wallet': '0x1234567890123456789012345678901234567890',
-            'private_key': 'test-key',
-            'approval_decision': 'partial',
-            'approved_payments': [all_payments[0]] if all_payments else [],
-            'comments': 'Partial approval - only first payment'
-        }
-        
-        resp3 = client.post('/submit_payment_approval', json=approval_data)
-        assert resp3.status_code == 200
-        approval_response = resp3.get_json()
-        
-        print(f"   ✅ Partial approval executed: {approval_response['execution_status']}")
-        
-        # Step 4: Verify execution result shows partial execution
-        resp4 = client.get(f'/payment_execution_result/{proposal_id}')
-        execution_result = resp4.get_json()
-        
-        print(f"   📊 Execution result for partial approval:")
-        print(f"     Status: {execution_result['execution_status']}")
-        print(f"     Executed: {len(execution_result.get('executed_payments', []))}")
-        print(f"     Failed/Skipped: {len(execution_result.get('failed_payments', []))}")
-        
-        print("   ✅ Partial approval workflow validated")
+    # Step 2: Get proposal to see available payments
+    resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
+    proposal_data = resp2.get_json()
+    all_payments = [p['payment_id'] for p in proposal_data['payments']]
+    
+    # Step 3: Approve only first payment (partial approval)
+    approval_data = {
+        'proposal_id': proposal_id,
+        'custody_wallet': '0x1234567890123456789012345678901234567890',
+        'private_key': 'test-key',
+        'approval_decision': 'partial',
+        'approved_payments': [all_payments[0]] if all_payments else [],
+        'comments': 'Partial approval - only first payment'
+    }
+    
+    resp3 = client.post('/submit_payment_approval', json=approval_data)
+    assert resp3.status_code == 200
+    approval_response = resp3.get_json()
+    
+    logger.info("   ✅ Partial approval executed: %s", approval_response['execution_status'])
+    
+    # Step 4: Verify execution result shows partial execution
+    resp4 = client.get(f'/payment_execution_result/{proposal_id}')
+    execution_result = resp4.get_json()
+    
+    logger.info("   📊 Execution result for partial approval:")
+    logger.info("     Status: %s", execution_result['execution_status'])
+    logger.info("     Executed: %s", len(execution_result.get('executed_payments', [])))
+    logger.info("     Failed/Skipped: %s", len(execution_result.get('failed_payments', [])))
+    
+    logger.info("   ✅ Partial approval workflow validated")
 
 
-def test_error_handling_workflow():
+def test_error_handling_workflow(client):
     """Test error scenarios in workflow."""
     
-    print("\n🚨 ERROR HANDLING WORKFLOW TEST")
-    print("=" * 40)
+    logger.info("\n🚨 ERROR HANDLING WORKFLOW TEST")
+    logger.info("=" * 40)
     
-    with app.test_client() as client:
-        # Test missing proposal
-        resp = client.get('/get_payment_proposal/nonexistent')
-        assert resp.status_code == 404
-        print("   ✅ Missing proposal → 404")
-        
-        # Test approval on nonexistent proposal
-        resp = client.post('/submit_payment_approval', json={
-            'proposal_id': 'nonexistent',
-            'custody_wallet': '0x123',
-            'private_key': 'test',
-            'approval_decision': 'approve_all'
-        })
-        assert resp.status_code == 404
-        print("   ✅ Approve nonexistent proposal → 404")
-        
-        # Test execution result on nonexistent proposal
-        resp = client.get('/payment_execution_result/nonexistent')
-        assert resp.status_code == 404
-        print("   ✅ Get result for nonexistent proposal → 404")
-        
-        print("   ✅ Error handling consistent across all endpoints")
+    # Test missing proposal
+    resp = client.get('/get_payment_proposal/nonexistent')
+    assert resp.status_code == 404
+    logger.info("   ✅ Missing proposal → 404")
+    
+    # Test approval on nonexistent proposal
+    resp = client.post('/submit_payment_approval', json={
+        'proposal_id': 'nonexistent',
+        'custody_wallet': '0x123',
+        'private_key': 'test',
+        'approval_decision': 'approve_all'
+    })
+    assert resp.status_code == 404
+    logger.info("   ✅ Approve nonexistent proposal → 404")
+    
+    # Test execution result on nonexistent proposal
+    resp = client.get('/payment_execution_result/nonexistent')
+    assert resp.status_code == 404
+    logger.info("   ✅ Get result for nonexistent proposal → 404")
+    
+    logger.info("   ✅ Error handling consistent across all endpoints")
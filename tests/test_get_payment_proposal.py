@@ -1,109 +1,74 @@
-import io
-import json
-import os
+import orjson
 import pytest
+from unittest.mock import MagicMock
 
-from flask_server import app, proposals
 
+def test_get_payment_proposal_not_found(client):
+    unknown_id = 'does-not-exist'
+    resp = client.get(f'/get_payment_proposal/{unknown_id}')
+    assert resp.status_code == 404
+    assert resp.content_type.startswith('application/json')
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
+
+
+def test_get_payment_proposal_internal_error(monkeypatch, client):
+    # Replace proposals in the flask_server module with a store whose lookups fail
+    bad = MagicMock()
+    bad.__contains__.side_effect = RuntimeError('boom contains')
+    bad.__getitem__.side_effect = RuntimeError('boom getitem')
+    bad.get.side_effect = RuntimeError('boom get')
+    bad.get_json.side_effect = RuntimeError('boom get_json')
+    monkeypatch.setattr('flask_server.proposals', bad, raising=True)
+
+    resp = client.get('/get_payment_proposal/any')
+    assert resp.status_code == 500
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
+
+
+def test_get_payment_proposal_happy_path(clear_storage, stub_generate, client, proposals, excel_upload, config_json):
+    data = {
+        'json': config_json,
+        'excel': excel_upload(),
+    }
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-EXCEL_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_financial_data.xlsx'))
-CONFIG_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_request.json'))
+    post_resp = client.post('/submit_request', data=data)
+    assert post_resp.status_code in (200, 202)
+    post_body = orjson.loads(post_resp.data)
+    pid = post_body['proposal_id']
 
+    # Now fetch the stored proposal
+    get_resp = client.get(f'/get_payment_proposal/{pid}')
+    assert get_resp.status_code == 200
+    assert get_resp.content_type.startswith('application/json')
+    body = orjson.loads(get_resp.data)
 
-def _load_excel_bytes():
-    with open(EXCEL_PATH, 'rb') as f:
-        return f.read()
+    # Should match stored in-memory object
+    assert pid in proposals
+    expected = proposals[pid]
+    assert body == expected
+    assert 'proposal_id' in body and 'report' in body and 'payments' in body
 
 
-def _load_config():
-    with open(CONFIG_PATH, 'r') as f:
-        cfg = json.load(f)
-    cfg.setdefault('private_key', 'test-key')
-    return cfg
+def test_get_payment_proposal_after_bulk_update(clear_storage, client, proposals):
+    # dict.update bypasses __setitem__; the store must still drop the cached JSON
+    proposals['pid-bulk'] = {"proposal_id": "pid-bulk", "report": "v1"}
+    assert orjson.loads(client.get('/get_payment_proposal/pid-bulk').data)['report'] == 'v1'
 
+    proposals.update({'pid-bulk': {"proposal_id": "pid-bulk", "report": "v2"}})
 
-@pytest.fixture(autouse=True)
-def clear_storage():
-    proposals.clear()
-    yield
-    proposals.clear()
+    assert orjson.loads(client.get('/get_payment_proposal/pid-bulk').data)['report'] == 'v2'
 
 
-def test_get_payment_proposal_not_found():
-    unknown_id = 'does-not-exist'
-    with app.test_client() as client:
-        resp = client.get(f'/get_payment_proposal/{unknown_id}')
-        assert resp.status_code == 404
-        assert resp.content_type.startswith('application/json')
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
-
-
-def test_get_payment_proposal_internal_error(monkeypatch):
-    class BadDict:
-        def __contains__(self, key):
-            raise RuntimeError('boom contains')
-        def __getitem__(self, key):
-            raise RuntimeError('boom getitem')
-
-    # Replace proposals in the flask_server module with a failing dict
-    monkeypatch.setattr('flask_server.proposals', BadDict(), raising=True)
-
-    with app.test_client() as client:
-        resp = client.get('/get_payment_proposal/any')
-        assert resp.status_code == 500
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
-
-
-def test_get_payment_proposal_happy_path(monkeypatch):
-    # Stub crew adapter to return deterministic proposal using generated proposal_id
-    def fake_generate(context):
-        pid = context.get('proposal_id') or 'pid-test'
-        return {
-            "proposal_id": pid,
-            "report": "Risk analysis OK. Generated payments.",
-            "payments": [
-                {
-                    "payment_id": "pay-1",
-                    "recipient_wallet": "0x123",
-                    "amount": 100.0,
-                    "reference": "INV-001"
-                }
-            ]
-        }
-
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
-
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
+def test_get_payment_proposal_serializes_decimals(clear_storage, client, proposals):
+    # Crew output can carry Decimals; the cached-bytes path must encode them like jsonify does
+    from decimal import Decimal
+    proposals['pid-dec'] = {"proposal_id": "pid-dec", "payments": [{"amount": Decimal('1.50')}]}
 
-    data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-    }
+    resp = client.get('/get_payment_proposal/pid-dec')
 
-    with app.test_client() as client:
-        post_resp = client.post('/submit_request', data=data)
-        assert post_resp.status_code in (200, 202)
-        post_body = post_resp.get_json()
-        pid = post_body['proposal_id']
-
-        # Now fetch the stored proposal
-        get_resp = client.get(f'/get_payment_proposal/{pid}')
-        assert get_resp.status_code == 200
-        assert get_resp.content_type.startswith('application/json')
-        body = get_resp.get_json()
-
-        # Should match stored in-memory object
-        assert pid in proposals
-        expected = proposals[pid]
-        assert body == expected
-        assert 'proposal_id' in body and 'report' in body and 'payments' in body
+    assert resp.status_code == 200
+    assert orjson.loads(resp.data)['payments'][0]['amount'] == '1.50'
@@ -0,0 +1,121 @@
+import fnmatch
+import sys
+import types
+
+import orjson
+import pytest
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis-py calls RedisProposalStore makes."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttl[key] = ex
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self.data.pop(key, None) is not None:
+                self.ttl.pop(key, None)
+                removed += 1
+        return removed
+
+    def scan_iter(self, match='*'):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+PROPOSAL = {"proposal_id": "pid-1", "payments": [{"payment_id": "pay-1", "amount": 100.0}]}
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def store(fake_redis):
+    from flask_server import RedisProposalStore
+    return RedisProposalStore(fake_redis, ttl_seconds=60)
+
+
+def test_set_and_get_round_trip(store, fake_redis):
+    store['pid-1'] = PROPOSAL
+
+    assert store['pid-1'] == PROPOSAL
+    assert store.get('pid-1') == PROPOSAL
+    assert orjson.loads(fake_redis.data['prop:pid-1']) == PROPOSAL
+
+
+def test_missing_proposal(store):
+    assert 'nope' not in store
+    assert store.get('nope') is None
+    assert store.get_json('nope') is None
+    with pytest.raises(KeyError):
+        store['nope']
+
+
+def test_contains(store):
+    store['pid-1'] = PROPOSAL
+
+    assert 'pid-1' in store
+
+
+def test_get_json_returns_stored_bytes(store):
+    store['pid-1'] = PROPOSAL
+
+    assert orjson.loads(store.get_json('pid-1')) == PROPOSAL
+
+
+def test_delete_missing_raises_key_error(store):
+    store['pid-1'] = PROPOSAL
+    del store['pid-1']
+
+    assert 'pid-1' not in store
+    with pytest.raises(KeyError):
+        del store['pid-1']
+
+
+def test_clear_only_removes_proposal_keys(store, fake_redis):
+    store['pid-1'] = PROPOSAL
+    store['pid-2'] = PROPOSAL
+    fake_redis.set('other:key', b'keep')
+
+    store.clear()
+
+    assert list(fake_redis.data) == ['other:key']
+
+
+def test_ttl_comes_from_proposal_ttl_seconds(monkeypatch, fake_redis):
+    import flask_server
+
+    monkeypatch.setenv('REDIS_URL', 'redis://localhost:6379/0')
+    monkeypatch.setenv('PROPOSAL_TTL_SECONDS', '120')
+    fake_module = types.SimpleNamespace(Redis=types.SimpleNamespace(from_url=lambda url: fake_redis))
+    monkeypatch.setitem(sys.modules, 'redis', fake_module)
+
+    store = flask_server._make_proposal_store()
+    store['pid-1'] = PROPOSAL
+
+    assert isinstance(store, flask_server.RedisProposalStore)
+    assert fake_redis.ttl['prop:pid-1'] == 120
+
+
+def test_expired_proposal_is_not_found(monkeypatch, client, fake_redis, store):
+    # An entry that expires between requests must surface as 404, not 500
+    monkeypatch.setattr('flask_server.proposals', store, raising=True)
+    store['pid-1'] = PROPOSAL
+    fake_redis.data.clear()
+
+    assert client.get('/get_payment_proposal/pid-1').status_code == 404
+    assert client.get('/payment_execution_result/pid-1').status_code == 404
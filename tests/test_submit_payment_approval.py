@@ -1,75 +1,44 @@
-import io
-import json
-import os
+import orjson
 import pytest
 
-from flask_server import app, proposals
 
-
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-EXCEL_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_financial_data.xlsx'))
-CONFIG_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_request.json'))
-
-
-def _load_excel_bytes():
-    with open(EXCEL_PATH, 'rb') as f:
-        return f.read()
-
-
-def _load_config():
-    with open(CONFIG_PATH, 'r') as f:
-        cfg = json.load(f)
-    cfg.setdefault('private_key', 'test-key')
-    return cfg
-
-
-@pytest.fixture(autouse=True)
-def clear_storage():
-    proposals.clear()
-    yield
-    proposals.clear()
-
-
-def test_submit_payment_approval_missing_json():
+def test_submit_payment_approval_missing_json(client):
     """Test missing JSON body returns 400."""
-    with app.test_client() as client:
-        resp = client.post('/submit_payment_approval')
-        assert resp.status_code == 400
-        assert resp.content_type.startswith('application/json')
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    resp = client.post('/submit_payment_approval')
+    assert resp.status_code == 400
+    assert resp.content_type.startswith('application/json')
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
 
 
-def test_submit_payment_approval_invalid_json():
+def test_submit_payment_approval_invalid_json(client):
     """Test invalid JSON syntax returns 400."""
-    with app.test_client() as client:
-        resp = client.post('/submit_payment_approval', 
-                          data='{"invalid": json syntax}',
-                          content_type='application/json')
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    resp = client.post('/submit_payment_approval', 
+                      data='{"invalid": json syntax}',
+                      content_type='application/json')
+    assert resp.status_code == 400
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
 
 
-def test_submit_payment_approval_missing_required_fields():
+def test_submit_payment_approval_missing_required_fields(client):
     """Test missing required fields returns 400."""
     incomplete_data = {
         "proposal_id": "test-id"
         # Missing custody_wallet, private_key, approval_decision
     }
     
-    with app.test_client() as client:
-        resp = client.post('/submit_payment_approval',
-                          json=incomplete_data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    resp = client.post('/submit_payment_approval',
+                      json=incomplete_data)
+    assert resp.status_code == 400
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
 
 
-def test_submit_payment_approval_invalid_approval_decision():
+def test_submit_payment_approval_invalid_approval_decision(client):
     """Test invalid approval_decision returns 400."""
     invalid_data = {
         "proposal_id": "test-id",
@@ -79,16 +48,15 @@ def test_submit_payment_approval_invalid_approval_decision():
         "comments": "test"
     }
     
-    with app.test_client() as client:
-        resp = client.post('/submit_payment_approval',
-                          json=invalid_data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    resp = client.post('/submit_payment_approval',
+                      json=invalid_data)
+    assert resp.status_code == 400
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
 
 
-def test_submit_payment_approval_partial_missing_approved_payments():
+def test_submit_payment_approval_partial_missing_approved_payments(client):
     """Test partial approval without approved_payments array returns 400."""
     partial_data = {
         "proposal_id": "test-id",
@@ -99,16 +67,15 @@ def test_submit_payment_approval_partial_missing_approved_payments():
         # Missing approved_payments for partial approval
     }
     
-    with app.test_client() as client:
-        resp = client.post('/submit_payment_approval',
-                          json=partial_data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    resp = client.post('/submit_payment_approval',
+                      json=partial_data)
+    assert resp.status_code == 400
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
 
 
-def test_submit_payment_approval_proposal_not_found():
+def test_submit_payment_approval_proposal_not_found(client):
     """Test unknown proposal_id returns 404."""
     approval_data = {
         "proposal_id": "non-existent-id",
@@ -118,314 +85,140 @@ def test_submit_payment_approval_proposal_not_found():
         "comments": "test"
     }
     
-    with app.test_client() as client:
-        resp = client.post('/submit_payment_approval',
-                          json=approval_data)
-        assert resp.status_code == 404
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
-
-
-def test_submit_payment_approval_crew_failure(monkeypatch):
+    resp = client.post('/submit_payment_approval',
+                      json=approval_data)
+    assert resp.status_code == 404
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
+
+
+@pytest.fixture
+def created_proposal(clear_storage, stub_generate, client, excel_upload, config_json):
+    """Submit a request through a stubbed crew adapter and return (client, proposal_id)."""
+    post_resp = client.post('/submit_request', data={
+        'json': config_json,
+        'excel': excel_upload(),
+    })
+    assert post_resp.status_code in (200, 202)
+    yield client, orjson.loads(post_resp.data)['proposal_id']
+
+
+def test_submit_payment_approval_crew_failure(monkeypatch, created_proposal):
     """Test crew execution failure returns 500."""
-    # First create a proposal
-    def fake_generate(context):
-        return {
-            "proposal_id": "test-proposal-crew-fail",
-            "report": "Test proposal for crew failure",
-            "payments": [
-                {
-                    "payment_id": "pay-1",
-                    "recipient_wallet": "0x456",
-                    "amount": 100.0,
-                    "reference": "TEST-001"
-                }
-            ]
-        }
+    client, pid = created_proposal
+
+    # Mock payment execution to fail
+    def failing_payment_executor(context):
+        raise RuntimeError("Payment execution failed")
 
     monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
+        'flask_server.execute_payment_approval_adapter',
+        failing_payment_executor,
         raising=True,
     )
 
-    # Create proposal first
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
-    data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    # Now test approval with crew failure
+    approval_data = {
+        "proposal_id": pid,
+        "custody_wallet": "0x123",
+        "private_key": "test-key",
+        "approval_decision": "approve_all",
+        "comments": "test approval"
     }
 
-    with app.test_client() as client:
-        post_resp = client.post('/submit_request', data=data)
-        assert post_resp.status_code in (200, 202)
-        post_body = post_resp.get_json()
-        pid = post_body['proposal_id']
-
-        # Mock payment execution to fail
-        def failing_payment_executor(context):
-            raise RuntimeError("Payment execution failed")
-
-        monkeypatch.setattr(
-            'flask_server.execute_payment_approval_adapter',
-            failing_payment_executor,
-            raising=True,
-        )
-
-        # Now test approval with crew failure
-        approval_data = {
-            "proposal_id": pid,
-            "custody_wallet": "0x123",
-            "private_key": "test-key",
-            "approval_decision": "approve_all",
-            "comments": "test approval"
-        }
-
-        resp = client.post('/submit_payment_approval',
-                          json=approval_data)
-        assert resp.status_code == 500
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
-
-
-def test_submit_payment_approval_approve_all_success(monkeypatch):
-    """Test successful approve_all scenario."""
-    # First create a proposal
-    def fake_generate(context):
-        return {
-            "proposal_id": "test-proposal-approve-all",
-            "report": "Test proposal for approve all",
-            "payments": [
-                {
-                    "payment_id": "pay-1",
-                    "recipient_wallet": "0x456",
-                    "amount": 100.0,
-                    "reference": "TEST-001"
-                },
-                {
-                    "payment_id": "pay-2",
-                    "recipient_wallet": "0x789",
-                    "amount": 200.0,
-                    "reference": "TEST-002"
-                }
-            ]
-        }
-
+    resp = client.post('/submit_payment_approval',
+                      json=approval_data)
+    assert resp.status_code == 500
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
+
+
+_EXEC_RESPONSES = {
+    'approve_all': {
+        "execution_status": "SUCCESS",
+        "message": "All payments executed successfully",
+        "executed_payments": ["pay-1", "pay-2", "pay-3"],
+        "failed_payments": []
+    },
+    'reject_all': {
+        "execution_status": "SUCCESS",
+        "message": "All payments rejected as requested",
+        "executed_payments": [],
+        "failed_payments": []
+    },
+    'partial': {
+        "execution_status": "PARTIAL_SUCCESS",
+        "message": "Executed 2 of 3 payments",
+        "executed_payments": ["pay-1", "pay-3"],
+        "failed_payments": []
+    },
+}
+
+
+def _fake_execute(context):
+    """Stub payment executor whose result follows the approval decision."""
+    return _EXEC_RESPONSES[context['approval_decision']]
+
+
+@pytest.fixture
+def stub_execute(monkeypatch):
     monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
+        'flask_server.execute_payment_approval_adapter',
+        _fake_execute,
         raising=True,
     )
 
-    # Create proposal first
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
-    data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+
+@pytest.mark.parametrize('decision,extra,exec_status', [
+    ('approve_all', {}, 'SUCCESS'),
+    ('reject_all', {}, 'SUCCESS'),
+    ('partial', {'approved_payments': ['pay-1', 'pay-3']}, 'PARTIAL_SUCCESS'),  # Only approve 2 of 3
+])
+def test_submit_payment_approval_success(stub_execute, created_proposal, decision, extra, exec_status):
+    """Test successful approve_all, reject_all and partial approval scenarios."""
+    client, pid = created_proposal
+
+    approval_data = {
+        "proposal_id": pid,
+        "custody_wallet": "0x123",
+        "private_key": "test-key",
+        "approval_decision": decision,
+        "comments": f"{decision} test",
+        **extra,
     }
 
-    with app.test_client() as client:
-        post_resp = client.post('/submit_request', data=data)
-        assert post_resp.status_code in (200, 202)
-        post_body = post_resp.get_json()
-        pid = post_body['proposal_id']
-
-        # Mock successful payment execution
-        def successful_payment_executor(context):
-            return {
-                "execution_status": "SUCCESS",
-                "message": "All payments executed successfully",
-                "executed_payments": ["pay-1", "pay-2"],
-                "failed_payments": []
-            }
-
-        monkeypatch.setattr(
-            'flask_server.execute_payment_approval_adapter',
-            successful_payment_executor,
-            raising=True,
-        )
-
-        # Test approve_all
-        approval_data = {
-            "proposal_id": pid,
-            "custody_wallet": "0x123",
-            "private_key": "test-key",
-            "approval_decision": "approve_all",
-            "comments": "Approve all payments"
-        }
-
-        resp = client.post('/submit_payment_approval',
-                          json=approval_data)
-        assert resp.status_code == 200
-        assert resp.content_type.startswith('application/json')
-        body = resp.get_json()
-        
-        # Verify response matches API doc
-        assert body.get('success') is True
-        assert body.get('execution_status') == "SUCCESS"
-        assert 'message' in body
-        assert body.get('next_step') == f"GET /payment_execution_result/{pid}"
-
-
-def test_submit_payment_approval_reject_all_success(monkeypatch):
-    """Test successful reject_all scenario."""
-    # First create a proposal
-    def fake_generate(context):
-        return {
-            "proposal_id": "test-proposal-reject-all",
-            "report": "Test proposal for reject all",
-            "payments": [
-                {
-                    "payment_id": "pay-1",
-                    "recipient_wallet": "0x456",
-                    "amount": 100.0,
-                    "reference": "TEST-001"
-                }
-            ]
-        }
+    resp = client.post('/submit_payment_approval',
+                      json=approval_data)
+    assert resp.status_code == 200
+    assert resp.content_type.startswith('application/json')
+    body = orjson.loads(resp.data)
 
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
+    # Verify response matches API doc
+    assert body.get('success') is True
+    assert body.get('execution_status') == exec_status
+    assert 'message' in body
+    assert body.get('next_step') == f"GET /payment_execution_result/{pid}"
 
-    # Create proposal first
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
-    data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-    }
 
-    with app.test_client() as client:
-        post_resp = client.post('/submit_request', data=data)
-        assert post_resp.status_code in (200, 202)
-        post_body = post_resp.get_json()
-        pid = post_body['proposal_id']
-
-        # Mock rejection (no payments executed)
-        def rejection_executor(context):
-            return {
-                "execution_status": "SUCCESS",
-                "message": "All payments rejected as requested",
-                "executed_payments": [],
-                "failed_payments": []
-            }
-
-        monkeypatch.setattr(
-            'flask_server.execute_payment_approval_adapter',
-            rejection_executor,
-            raising=True,
-        )
-
-        # Test reject_all
-        approval_data = {
-            "proposal_id": pid,
-            "custody_wallet": "0x123",
-            "private_key": "test-key",
-            "approval_decision": "reject_all",
-            "comments": "Reject all payments"
-        }
-
-        resp = client.post('/submit_payment_approval',
-                          json=approval_data)
-        assert resp.status_code == 200
-        body = resp.get_json()
-        
-        # Verify response matches API doc
-        assert body.get('success') is True
-        assert body.get('execution_status') == "SUCCESS"
-        assert 'message' in body
-        assert body.get('next_step') == f"GET /payment_execution_result/{pid}"
-
-
-def test_submit_payment_approval_partial_success(monkeypatch):
-    """Test successful partial approval scenario."""
-    # First create a proposal
-    def fake_generate(context):
-        return {
-            "proposal_id": "test-proposal-partial",
-            "report": "Test proposal for partial approval",
-            "payments": [
-                {
-                    "payment_id": "pay-1",
-                    "recipient_wallet": "0x456",
-                    "amount": 100.0,
-                    "reference": "TEST-001"
-                },
-                {
-                    "payment_id": "pay-2",
-                    "recipient_wallet": "0x789",
-                    "amount": 200.0,
-                    "reference": "TEST-002"
-                },
-                {
-                    "payment_id": "pay-3",
-                    "recipient_wallet": "0xabc",
-                    "amount": 300.0,
-                    "reference": "TEST-003"
-                }
-            ]
-        }
+def test_get_payment_proposal_reflects_approval(stub_execute, created_proposal):
+    """A proposal fetched (and cached) before approval is re-served with its execution result."""
+    client, pid = created_proposal
 
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
+    before = client.get(f'/get_payment_proposal/{pid}')
+    assert before.status_code == 200
+    assert 'execution_result' not in orjson.loads(before.data)
 
-    # Create proposal first
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
-    data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-    }
+    resp = client.post('/submit_payment_approval', json={
+        "proposal_id": pid,
+        "custody_wallet": "0x123",
+        "private_key": "test-key",
+        "approval_decision": "approve_all",
+        "comments": "cache invalidation test",
+    })
+    assert resp.status_code == 200
 
-    with app.test_client() as client:
-        post_resp = client.post('/submit_request', data=data)
-        assert post_resp.status_code in (200, 202)
-        post_body = post_resp.get_json()
-        pid = post_body['proposal_id']
-
-        # Mock partial execution
-        def partial_executor(context):
-            approved_payments = context.get('approved_payments', [])
-            return {
-                "execution_status": "PARTIAL_SUCCESS",
-                "message": f"Executed {len(approved_payments)} of 3 payments",
-                "executed_payments": approved_payments,
-                "failed_payments": []
-            }
-
-        monkeypatch.setattr(
-            'flask_server.execute_payment_approval_adapter',
-            partial_executor,
-            raising=True,
-        )
-
-        # Test partial approval
-        approval_data = {
-            "proposal_id": pid,
-            "custody_wallet": "0x123",
-            "private_key": "test-key",
-            "approval_decision": "partial",
-            "approved_payments": ["pay-1", "pay-3"],  # Only approve 2 of 3
-            "comments": "Partial approval - only pay-1 and pay-3"
-        }
-
-        resp = client.post('/submit_payment_approval',
-                          json=approval_data)
-        assert resp.status_code == 200
-        body = resp.get_json()
-        
-        # Verify response matches API doc
-        assert body.get('success') is True
-        assert body.get('execution_status') == "PARTIAL_SUCCESS"
-        assert 'message' in body
-        assert body.get('next_step') == f"GET /payment_execution_result/{pid}"
+    after = client.get(f'/get_payment_proposal/{pid}')
+    assert after.status_code == 200
+    assert orjson.loads(after.data)['execution_result'] == _EXEC_RESPONSES['approve_all']
@@ -1,208 +1,78 @@
-import io
-import json
-import os
+import orjson
 import pytest
 
-from flask_server import app, proposals, generate_payment_proposal_adapter
-
-
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-EXCEL_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_financial_data.xlsx'))
-CONFIG_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_request.json'))
-
-
-def _load_excel_bytes():
-    with open(EXCEL_PATH, 'rb') as f:
-        return f.read()
-
-
-def _load_config():
-    with open(CONFIG_PATH, 'r') as f:
-        cfg = json.load(f)
-    # Ensure private_key exists for completeness; docs include it
-    cfg.setdefault('private_key', 'test-key')
-    return cfg
-
-
-@pytest.fixture(autouse=True)
-def clear_storage():
-    proposals.clear()
-    yield
-    proposals.clear()
-
-
-def test_submit_request_happy_path(monkeypatch, tmp_path):
-    # Stub crew adapter to return deterministic proposal
-    def fake_generate(context):
-        pid = context.get('proposal_id') or 'pid-test'
-        return {
-            "proposal_id": pid,
-            "report": "Risk analysis OK. Generated payments.",
-            "payments": [
-                {
-                    "payment_id": "pay-1",
-                    "recipient_wallet": "0x123",
-                    "amount": 100.0,
-                    "reference": "INV-001"
-                }
-            ]
-        }
-
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
-
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
 
+def test_submit_request_happy_path(clear_storage, stub_generate, client, proposals, excel_upload, config_json):
     data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+        'json': config_json,
+        'excel': excel_upload(),
     }
 
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code in (200, 202)
-        assert resp.content_type.startswith('application/json')
-        body = resp.get_json()
-        assert body.get('success') is True
-        assert 'proposal_id' in body
-        assert 'next_step' in body and '/get_payment_proposal/' in body['next_step']
+    resp = client.post('/submit_request', data=data)
+    assert resp.status_code in (200, 202)
+    assert resp.content_type.startswith('application/json')
+    body = orjson.loads(resp.data)
+    assert body.get('success') is True
+    assert 'proposal_id' in body
+    assert 'next_step' in body and '/get_payment_proposal/' in body['next_step']
 
-        pid = body['proposal_id']
-        # proposal persisted in memory
-        assert pid in proposals
-        stored = proposals[pid]
-        assert isinstance(stored, dict)
-        assert stored.get('proposal_id') == pid
-        assert 'payments' in stored and isinstance(stored['payments'], list)
+    pid = body['proposal_id']
+    # proposal persisted in memory
+    assert pid in proposals
+    stored = proposals[pid]
+    assert isinstance(stored, dict)
+    assert stored.get('proposal_id') == pid
+    assert 'payments' in stored and isinstance(stored['payments'], list)
 
 
-def test_submit_request_missing_excel(monkeypatch):
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        lambda ctx: {},
-        raising=True,
-    )
-
-    cfg = _load_config()
-    data = {'json': json.dumps(cfg)}
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
-
-
-def test_submit_request_missing_json(monkeypatch):
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        lambda ctx: {},
-        raising=True,
-    )
-
-    excel_bytes = _load_excel_bytes()
-    data = {
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    }
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+def _drop_excel(data, stub_adapter):
+    del data['excel']
 
 
-def test_submit_request_invalid_json(monkeypatch):
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        lambda ctx: {},
-        raising=True,
-    )
+def _drop_json(data, stub_adapter):
+    del data['json']
 
-    excel_bytes = _load_excel_bytes()
-    data = {
-        'json': '{not json}',
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    }
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
 
+def _corrupt_json(data, stub_adapter):
+    data['json'] = '{not json}'
 
-def test_submit_request_invalid_schema(monkeypatch):
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        lambda ctx: {},
-        raising=True,
-    )
 
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
+def _drop_risk_config(data, stub_adapter):
     # Remove required key to trigger schema error
+    cfg = orjson.loads(data['json'])
     cfg.pop('risk_config', None)
-    data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    }
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code == 400
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    data['json'] = orjson.dumps(cfg).decode()
 
 
-def test_submit_request_crew_failure(monkeypatch):
+def _crew_boom(data, stub_adapter):
     def boom(context):
         raise RuntimeError('Crew failure')
 
-    monkeypatch.setattr('flask_server.generate_payment_proposal_adapter', boom, raising=True)
+    stub_adapter(boom)
 
-    excel_bytes = _load_excel_bytes()
-    cfg = _load_config()
+
+@pytest.mark.parametrize('mutate,status', [
+    (_drop_excel, 400),
+    (_drop_json, 400),
+    (_corrupt_json, 400),
+    (_drop_risk_config, 400),
+    (_crew_boom, 500),
+], ids=['missing_excel', 'missing_json', 'invalid_json', 'invalid_schema', 'crew_failure'])
+def test_submit_request_errors(stub_generate, stub_adapter, client, excel_upload, config_json, mutate, status):
     data = {
-        'json': json.dumps(cfg),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        'json': config_json,
+        'excel': excel_upload()
     }
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code == 500
-        body = resp.get_json()
-        assert body.get('success') is False
-        assert 'error' in body
+    mutate(data, stub_adapter)
+    resp = client.post('/submit_request', data=data)
+    assert resp.status_code == status
+    body = orjson.loads(resp.data)
+    assert body.get('success') is False
+    assert 'error' in body
 
 
-def test_submit_request_new_api_spec_without_custody_wallet(monkeypatch):
+def test_submit_request_new_api_spec_without_custody_wallet(clear_storage, stub_generate, client, proposals, excel_upload):
     """Test that submit_request works with NEW API spec (no custody_wallet/private_key required)."""
-    def fake_generate(context):
-        pid = context.get('proposal_id') or 'pid-test-new-api'
-        return {
-            "proposal_id": pid,
-            "report": "Risk analysis OK. Generated payments with new API spec.",
-            "payments": [
-                {
-                    "payment_id": "pay-new-1",
-                    "recipient_wallet": "0x456",
-                    "amount": 200.0,
-                    "reference": "INV-002"
-                }
-            ]
-        }
-
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
-
-    excel_bytes = _load_excel_bytes()
     # Create config per NEW API documentation (no custody_wallet, no private_key)
     new_api_config = {
         "user_id": "test_user_new_api",
@@ -217,52 +87,29 @@ def test_submit_request_new_api_spec_without_custody_wallet(monkeypatch):
     }
 
     data = {
-        'json': json.dumps(new_api_config),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+        'json': orjson.dumps(new_api_config).decode(),
+        'excel': excel_upload(),
     }
 
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code in (200, 202)
-        assert resp.content_type.startswith('application/json')
-        body = resp.get_json()
-        assert body.get('success') is True
-        assert 'proposal_id' in body
-        assert 'next_step' in body and '/get_payment_proposal/' in body['next_step']
+    resp = client.post('/submit_request', data=data)
+    assert resp.status_code in (200, 202)
+    assert resp.content_type.startswith('application/json')
+    body = orjson.loads(resp.data)
+    assert body.get('success') is True
+    assert 'proposal_id' in body
+    assert 'next_step' in body and '/get_payment_proposal/' in body['next_step']
 
-        pid = body['proposal_id']
-        # proposal persisted in memory
-        assert pid in proposals
-        stored = proposals[pid]
-        assert isinstance(stored, dict)
-        assert stored.get('proposal_id') == pid
-        assert 'payments' in stored and isinstance(stored['payments'], list)
+    pid = body['proposal_id']
+    # proposal persisted in memory
+    assert pid in proposals
+    stored = proposals[pid]
+    assert isinstance(stored, dict)
+    assert stored.get('proposal_id') == pid
+    assert 'payments' in stored and isinstance(stored['payments'], list)
 
 
-def test_submit_request_optional_user_notes(monkeypatch):
+def test_submit_request_optional_user_notes(clear_storage, stub_generate, client, excel_upload):
     """Test that user_notes is optional in the new API spec."""
-    def fake_generate(context):
-        pid = context.get('proposal_id') or 'pid-test-no-notes'
-        return {
-            "proposal_id": pid,
-            "report": "Risk analysis OK. No user notes provided.",
-            "payments": [
-                {
-                    "payment_id": "pay-no-notes-1",
-                    "recipient_wallet": "0x789",
-                    "amount": 300.0,
-                    "reference": "INV-003"
-                }
-            ]
-        }
-
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
-
-    excel_bytes = _load_excel_bytes()
     # Config without user_notes
     minimal_config = {
         "user_id": "test_user_minimal",
@@ -277,19 +124,18 @@ def test_submit_request_optional_user_notes(monkeypatch):
     }
 
     data = {
-        'json': json.dumps(minimal_config),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+        'json': orjson.dumps(minimal_config).decode(),
+        'excel': excel_upload(),
     }
 
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code in (200, 202)
-        body = resp.get_json()
-        assert body.get('success') is True
-        assert 'proposal_id' in body
+    resp = client.post('/submit_request', data=data)
+    assert resp.status_code in (200, 202)
+    body = orjson.loads(resp.data)
+    assert body.get('success') is True
+    assert 'proposal_id' in body
 
 
-def test_submit_request_backward_compatibility_with_extra_fields(monkeypatch):
+def test_submit_request_backward_compatibility_with_extra_fields(clear_storage, stub_adapter, client, excel_upload, config_json):
     """Test that endpoint accepts extra fields (like old custody_wallet) but doesn't require them."""
     def fake_generate(context):
         pid = context.get('proposal_id') or 'pid-test-backward-compat'
@@ -309,24 +155,16 @@ def test_submit_request_backward_compatibility_with_extra_fields(monkeypatch):
             ]
         }
 
-    monkeypatch.setattr(
-        'flask_server.generate_payment_proposal_adapter',
-        fake_generate,
-        raising=True,
-    )
-
-    excel_bytes = _load_excel_bytes()
-    # Use old config format (should still work)
-    old_format_config = _load_config()  # This includes custody_wallet
+    stub_adapter(fake_generate)
 
+    # Use old config format (should still work); it includes custody_wallet
     data = {
-        'json': json.dumps(old_format_config),
-        'excel': (io.BytesIO(excel_bytes), os.path.basename(EXCEL_PATH), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+        'json': config_json,
+        'excel': excel_upload(),
     }
 
-    with app.test_client() as client:
-        resp = client.post('/submit_request', data=data)
-        assert resp.status_code in (200, 202)
-        body = resp.get_json()
-        assert body.get('success') is True
-        assert 'proposal_id' in body
+    resp = client.post('/submit_request', data=data)
+    assert resp.status_code in (200, 202)
+    body = orjson.loads(resp.data)
+    assert body.get('success') is True
+    assert 'proposal_id' in body
@@ -0,0 +1,229 @@
+import threading
+import time
+import types
+
+import orjson
+import pytest
+
+
+VALID_ADDRESS = '0xdAC17F958D2ee523a2206206994597C13D831ec7'
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    # Simulation mode unless a test opts in to a (fake) Infura key
+    monkeypatch.setattr('tools.treasury_usdt_payment_tool.load_dotenv', lambda *a, **k: None)
+    monkeypatch.delenv('INFURA_API_KEY', raising=False)
+    monkeypatch.delenv('ETH_PRICE_USD', raising=False)
+    from tools.treasury_usdt_payment_tool import TreasuryUSDTPaymentTool
+    return TreasuryUSDTPaymentTool()
+
+
+def test_ensure_web3_initializes_once_across_threads(tool, monkeypatch):
+    calls = []
+
+    def slow_init():
+        calls.append(1)
+        time.sleep(0.05)
+
+    tool._infura_key = 'test-key'
+    monkeypatch.setattr(tool, '_initialize_web3', slow_init)
+
+    threads = [threading.Thread(target=tool._ensure_web3) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert tool._web3_initialized is True
+
+
+def test_validate_address_initializes_web3(tool, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tool, '_ensure_web3', lambda: calls.append(1))
+
+    result = tool._run('validate_address', wallet_address=VALID_ADDRESS)
+
+    assert calls == [1]
+    assert 'VALID' in result
+
+
+def test_gas_price_rpc_runs_outside_cache_lock(tool):
+    class FakeEth:
+        @property
+        def gas_price(self):
+            # Other threads must be able to read the cache while the RPC is in flight
+            assert not tool._gas_price_lock.locked()
+            return 30 * 10**9
+
+    class FakeW3:
+        eth = FakeEth()
+
+    tool._w3 = FakeW3()
+
+    assert tool._get_gas_price() == 30 * 10**9
+    assert tool._gas_price_cache["value"] == 30 * 10**9
+
+
+@pytest.mark.parametrize('raw', ['3456.78x', '', ' ', 'nan', '-1'])
+def test_invalid_eth_price_falls_back_to_default(tool, monkeypatch, raw):
+    from tools.treasury_usdt_payment_tool import _DEFAULT_ETH_PRICE_CENTS, TreasuryUSDTPaymentTool
+    monkeypatch.setenv('ETH_PRICE_USD', raw)
+
+    assert TreasuryUSDTPaymentTool()._eth_price_cents == _DEFAULT_ETH_PRICE_CENTS
+
+
+def test_fractional_eth_price_is_accepted(tool, monkeypatch):
+    from tools.treasury_usdt_payment_tool import TreasuryUSDTPaymentTool
+    monkeypatch.setenv('ETH_PRICE_USD', ' 3456.78 ')
+
+    priced = TreasuryUSDTPaymentTool()
+
+    assert priced._eth_price_cents == 345_678
+    assert '(≈$3456.78)' in priced._format_balance(VALID_ADDRESS, 10**18, 0.0)
+
+
+def test_rpc_with_retry_retries_once_on_timeout(monkeypatch):
+    import requests
+    from tools.treasury_usdt_payment_tool import _rpc_with_retry
+    monkeypatch.setattr('tools.treasury_usdt_payment_tool.time.sleep', lambda s: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise requests.exceptions.Timeout('slow node')
+        return 42
+
+    assert _rpc_with_retry(flaky) == 42
+    assert len(attempts) == 2
+
+
+def test_rpc_with_retry_gives_up_after_one_retry_on_429(monkeypatch):
+    import requests
+    from tools.treasury_usdt_payment_tool import _rpc_with_retry
+    monkeypatch.setattr('tools.treasury_usdt_payment_tool.time.sleep', lambda s: None)
+    response = requests.Response()
+    response.status_code = 429
+    attempts = []
+
+    def rate_limited():
+        attempts.append(1)
+        raise requests.exceptions.HTTPError('too many requests', response=response)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        _rpc_with_retry(rate_limited)
+    assert len(attempts) == 2
+
+
+def test_rpc_with_retry_does_not_retry_other_errors():
+    from tools.treasury_usdt_payment_tool import _rpc_with_retry
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError('execution reverted')
+
+    with pytest.raises(ValueError):
+        _rpc_with_retry(broken)
+    assert attempts == [1]
+
+
+def test_execute_payment_skips_web3_for_invalid_arguments(tool, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tool, '_ensure_web3', lambda: calls.append(1))
+
+    result = orjson.loads(tool._run('execute_payment', wallet_address=VALID_ADDRESS, amount_usdt=5.0))
+
+    assert result['reason'] == 'MISSING_RECIPIENT_WALLET'
+    assert calls == []
+
+
+class _FakeAggregate3:
+    """Stands in for multicall.functions: records the calls and returns canned results."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = None
+
+    def aggregate3(self, calls):
+        self.calls = calls
+        return types.SimpleNamespace(call=lambda: self.results)
+
+
+def test_check_balance_decodes_multicall_results(tool, monkeypatch):
+    from tools.treasury_usdt_payment_tool import _BALANCE_OF_SELECTOR, _GET_ETH_BALANCE_SELECTOR
+    eth_wei = 2 * 10**18 + 5 * 10**14  # 2.0005 ETH
+    usdt_units = 1_234_500_000  # 1234.50 USDT (6 decimals)
+    functions = _FakeAggregate3([
+        (True, eth_wei.to_bytes(32, 'big')),
+        (True, usdt_units.to_bytes(32, 'big')),
+    ])
+    monkeypatch.setattr(tool, '_ensure_web3', lambda: None)
+    tool._w3 = object()
+    tool._multicall = types.SimpleNamespace(functions=functions)
+
+    report = tool._run('check_balance', wallet_address=VALID_ADDRESS.lower())
+
+    address_word = bytes.fromhex(VALID_ADDRESS[2:]).rjust(32, b'\0')
+    assert functions.calls == [
+        (tool._multicall_address, False, _GET_ETH_BALANCE_SELECTOR + address_word),
+        (tool._usdt_contract_address, False, _BALANCE_OF_SELECTOR + address_word),
+    ]
+    assert 'ETH Balance: 2.000500 ETH (≈$7001.75)' in report
+    assert 'USDT Balance: 1234.50 USDT' in report
+    assert 'Warning' not in report
+
+
+def test_check_balance_warns_below_gas_threshold(tool):
+    report = tool._format_balance(VALID_ADDRESS, 4 * 10**14, 10.0)  # 0.0004 ETH
+
+    assert 'ETH Balance: 0.000400 ETH (≈$1.40)' in report
+    assert 'insufficient for gas fees' in report
+
+
+def test_estimate_gas_uses_integer_wei_and_cents(tool, monkeypatch):
+    monkeypatch.setattr(tool, '_ensure_web3', lambda: None)
+    monkeypatch.setattr(tool, '_get_gas_price', lambda: 20 * 10**9)
+    tool._w3 = object()
+
+    report = tool._run('estimate_gas')
+
+    # 20 gwei * 1.35 * 401,000 gas = 0.010827 ETH; at $3500 that is $37.89
+    assert 'Current Gas Price: 20.00 Gwei' in report
+    assert 'Adjusted Gas Price: 27.00 Gwei' in report
+    assert 'Estimated Cost: 0.010827 ETH' in report
+    assert 'Estimated Cost USD: $37.89 (at $3500.00/ETH)' in report
+
+
+@pytest.mark.parametrize('action,kwargs,expected', [
+    ('check_balance', {'wallet_address': VALID_ADDRESS}, 'Wallet Balance Check:'),
+    ('estimate_gas', {}, 'Gas Estimation for USDT Transaction:'),
+    ('validate_address', {'recipient_address': VALID_ADDRESS}, 'Status: ✅ VALID'),
+    ('check_status', {'transaction_id': 'TX1234ABCD'}, 'Transaction ID: TX1234ABCD'),
+])
+def test_dispatch_routes_each_text_action(tool, action, kwargs, expected):
+    assert expected in tool._run(action, **kwargs)
+
+
+def test_dispatch_routes_execute_payment(tool):
+    result = orjson.loads(tool._run(
+        'execute_payment',
+        wallet_address=VALID_ADDRESS,
+        recipient_address=VALID_ADDRESS,
+        amount_usdt=10.0,
+        private_key='test-key',
+        payment_id='pay-1',
+    ))
+
+    assert result['payment_id'] == 'pay-1'
+    assert result['status'] in ('SUCCESS', 'FAILED')
+    assert result['amount'] == 10.0
+
+
+def test_dispatch_covers_every_action(tool):
+    assert set(tool._dispatch) == {
+        'check_balance', 'estimate_gas', 'execute_payment', 'validate_address', 'check_status',
+    }
+    assert tool._run('bogus').startswith('Unknown action: bogus.')
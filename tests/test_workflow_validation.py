@@ -1,30 +1,70 @@
-import io
-import json
-import os
+import logging
+import re
+import orjson
 import pytest
-from unittest.mock import patch
-from flask_server import app, proposals
+from unittest.mock import Mock
 
+# Progress output goes through logging (lazy %-formatting); view with `pytest --log-cli-level=INFO`
+logger = logging.getLogger(__name__)
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-EXCEL_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_financial_data.xlsx'))
-CONFIG_PATH = os.path.abspath(os.path.join(PROJECT_ROOT, '..', 'Agent', 'test_data', 'dummy_request.json'))
+# Ethereum address shape (0x + 40 hex digits), compiled once for every payment checked
+_ETH_ADDRESS_RE = re.compile(r'0x[0-9a-fA-F]{40}')
 
 
-@pytest.fixture(autouse=True)
-def clear_storage():
-    proposals.clear()
-    yield
-    proposals.clear()
+# Mock crew responses that match API documentation; built once and treated as read-only
+_MOCK_PROPOSAL = {
+    "proposal_id": "test-proposal-123",
+    "report": "Generated proposal based on risk analysis. All payments validated and approved for execution.",
+    "payments": [
+        {
+            "payment_id": "pay-00001",
+            "recipient_wallet": "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6",
+            "amount": 150.75,
+            "reference": "Development services"
+        },
+        {
+            "payment_id": "pay-00002",
+            "recipient_wallet": "0x1234567890123456789012345678901234567890",
+            "amount": 99.75,
+            "reference": "Marketing services"
+        }
+    ]
+}
 
+_MOCK_EXECUTION_RESULT = {
+    "proposal_id": "test-proposal-123",
+    "execution_status": "SUCCESS",
+    "executed_payments": [
+        {
+            "payment_id": "pay-00001",
+            "recipient_wallet": "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6",
+            "amount": 150.75,
+            "reference": "Development services",
+            "transaction_hash": "0xabc123def456",
+            "status": "SUCCESS"
+        },
+        {
+            "payment_id": "pay-00002", 
+            "recipient_wallet": "0x1234567890123456789012345678901234567890",
+            "amount": 99.75,
+            "reference": "Marketing services",
+            "transaction_hash": "0xdef456ghi789",
+            "status": "SUCCESS"
+        }
+    ],
+    "failed_payments": [],
+    "message": "All 2 payments executed successfully"
+}
 
-def _load_test_data():
-    """Load test Excel and JSON configuration."""
-    with open(EXCEL_PATH, 'rb') as f:
-        excel_bytes = f.read()
-    with open(CONFIG_PATH, 'r') as f:
-        cfg = json.load(f)
-    return excel_bytes, cfg
+
+@pytest.fixture
+def crew_mocks(monkeypatch):
+    """Swap both crew adapters on the flask_server module for Mocks; returns (proposal_gen, execution)."""
+    import flask_server
+    mock_proposal_gen, mock_execution = Mock(), Mock()
+    monkeypatch.setattr(flask_server, 'generate_payment_proposal_adapter', mock_proposal_gen)
+    monkeypatch.setattr(flask_server, 'execute_payment_approval_adapter', mock_execution)
+    return mock_proposal_gen, mock_execution
 
 
 def _validate_api_response_schema(data, endpoint_name):
@@ -49,6 +89,7 @@ def _validate_api_response_schema(data, endpoint_name):
         for payment in data['payments']:
             assert 'payment_id' in payment, "payment missing payment_id"
             assert 'recipient_wallet' in payment, "payment missing recipient_wallet"
+            assert _ETH_ADDRESS_RE.fullmatch(payment['recipient_wallet']), "recipient_wallet must be an Ethereum address"
             assert 'amount' in payment, "payment missing amount"
             assert 'reference' in payment, "payment missing reference"
             assert isinstance(payment['amount'], (int, float)), "amount must be number"
@@ -72,229 +113,173 @@ def _validate_api_response_schema(data, endpoint_name):
         assert isinstance(data['failed_payments'], list), "failed_payments must be array"
 
 
-def test_workflow_json_schema_validation():
+def test_workflow_json_schema_validation(clear_storage, crew_mocks, client, excel_upload, config_json):
     """Test complete workflow with mocked crew to validate JSON schemas match API documentation exactly."""
     
-    print("\n🔄 WORKFLOW JSON SCHEMA VALIDATION")
-    print("=" * 50)
-    
-    # Mock crew responses that match API documentation
-    mock_proposal_data = {
-        "proposal_id": "test-proposal-123",
-        "report": "Generated proposal based on risk analysis. All payments validated and approved for execution.",
-        "payments": [
-            {
-                "payment_id": "pay-00001",
-                "recipient_wallet": "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6",
-                "amount": 150.75,
-                "reference": "Development services"
-            },
-            {
-                "payment_id": "pay-00002",
-                "recipient_wallet": "0x1234567890123456789012345678901234567890",
-                "amount": 99.75,
-                "reference": "Marketing services"
-            }
-        ]
+    logger.info("\n🔄 WORKFLOW JSON SCHEMA VALIDATION")
+    logger.info("=" * 50)
+    
+    mock_proposal_gen, mock_execution = crew_mocks
+
+    # The approval handler adds execution_result to the stored proposal, so hand out a shallow copy
+    mock_proposal_gen.return_value = dict(_MOCK_PROPOSAL)
+    mock_execution.return_value = _MOCK_EXECUTION_RESULT
+    
+    # ==================== STEP 1: Submit Request ====================
+    logger.info("\n📝 STEP 1: POST /submit_request - JSON Schema Validation")
+    
+    data = {
+        'json': config_json,
+        'excel': excel_upload('test.xlsx'),
     }
     
-    mock_execution_result = {
-        "proposal_id": "test-proposal-123",
-        "execution_status": "SUCCESS",
-        "executed_payments": [
-            {
-                "payment_id": "pay-00001",
-                "recipient_wallet": "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6",
-                "amount": 150.75,
-                "reference": "Development services",
-                "transaction_hash": "0xabc123def456",
-                "status": "SUCCESS"
-            },
-            {
-                "payment_id": "pay-00002", 
-                "recipient_wallet": "0x1234567890123456789012345678901234567890",
-                "amount": 99.75,
-                "reference": "Marketing services",
-                "transaction_hash": "0xdef456ghi789",
-                "status": "SUCCESS"
-            }
-        ],
-        "failed_payments": [],
-        "message": "All 2 payments executed successfully"
+    resp1 = client.post('/submit_request', data=data)
+    assert resp1.status_code in (200, 202)
+    body1 = orjson.loads(resp1.data)
+    
+    _validate_api_response_schema(body1, "submit_request")
+    logger.info("   ✅ submit_request response matches API documentation")
+    
+    proposal_id = body1['proposal_id']
+    
+    # ==================== STEP 2: Get Payment Proposal ====================
+    logger.info("\n📋 STEP 2: GET /get_payment_proposal/%s - JSON Schema Validation", proposal_id)
+    
+    resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
+    assert resp2.status_code == 200
+    proposal_data = orjson.loads(resp2.data)
+    
+    _validate_api_response_schema(proposal_data, "get_payment_proposal")
+    logger.info("   ✅ get_payment_proposal response matches API documentation")
+    logger.info("   📊 Payments: %s", len(proposal_data['payments']))
+    
+    # ==================== STEP 3: Submit Payment Approval ====================
+    logger.info("\n💰 STEP 3: POST /submit_payment_approval - JSON Schema Validation")
+    
+    approval_data = {
+        'proposal_id': proposal_id,
+        'custody_wallet': '0x1234567890123456789012345678901234567890',
+        'private_key': 'test-private-key',
+        'approval_decision': 'approve_all',
+        'comments': 'Schema validation test'
     }
     
-    excel_bytes, cfg = _load_test_data()
+    resp3 = client.post('/submit_payment_approval', json=approval_data)
+    assert resp3.status_code == 200
+    approval_response = orjson.loads(resp3.data)
     
-    with patch('flask_server.generate_payment_proposal_adapter') as mock_proposal_gen, \
-         patch('flask_server.execute_payment_approval_adapter') as mock_execution:
-        
-        mock_proposal_gen.return_value = mock_proposal_data
-        mock_execution.return_value = mock_execution_result
-        
-        with app.test_client() as client:
-            
-            # ==================== STEP 1: Submit Request ====================
-            print(f"\n📝 STEP 1: POST /submit_request - JSON Schema Validation")
-            
-            data = {
-                'json': json.dumps(cfg),
-                'excel': (io.BytesIO(excel_bytes), 'test.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-            }
-            
-            resp1 = client.post('/submit_request', data=data)
-            assert resp1.status_code in (200, 202)
-            body1 = resp1.get_json()
-            
-            _validate_api_response_schema(body1, "submit_request")
-            print(f"   ✅ submit_request response matches API documentation")
-            
-            proposal_id = body1['proposal_id']
-            
-            # ==================== STEP 2: Get Payment Proposal ====================
-            print(f"\n📋 STEP 2: GET /get_payment_proposal/{proposal_id} - JSON Schema Validation")
-            
-            resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
-            assert resp2.status_code == 200
-            proposal_data = resp2.get_json()
-            
-            _validate_api_response_schema(proposal_data, "get_payment_proposal")
-            print(f"   ✅ get_payment_proposal response matches API documentation")
-            print(f"   📊 Payments: {len(proposal_data['payments'])}")
-            
-            # ==================== STEP 3: Submit Payment Approval ====================
-            print(f"\n💰 STEP 3: POST /submit_payment_approval - JSON Schema Validation")
-            
-            approval_data = {
-                'proposal_id': proposal_id,
-                'custody_wallet': '0x1234567890123456789012345678901234567890',
-                'private_key': 'test-private-key',
-                'approval_decision': 'approve_all',
-                'comments': 'Schema validation test'
-            }
-            
-            resp3 = client.post('/submit_payment_approval', json=approval_data)
-            assert resp3.status_code == 200
-            approval_response = resp3.get_json()
-            
-            _validate_api_response_schema(approval_response, "submit_payment_approval")
-            print(f"   ✅ submit_payment_approval response matches API documentation")
-            print(f"   📊 Execution Status: {approval_response['execution_status']}")
-            
-            # ==================== STEP 4: Get Payment Execution Result ====================
-            print(f"\n📊 STEP 4: GET /payment_execution_result/{proposal_id} - JSON Schema Validation")
-            
-            resp4 = client.get(f'/payment_execution_result/{proposal_id}')
-            assert resp4.status_code == 200
-            execution_result = resp4.get_json()
-            
-            _validate_api_response_schema(execution_result, "payment_execution_result")
-            print(f"   ✅ payment_execution_result response matches API documentation")
-            print(f"   📊 Executed: {len(execution_result['executed_payments'])}, Failed: {len(execution_result['failed_payments'])}")
-            
-            print(f"\n🎯 VALIDATION SUMMARY")
-            print("=" * 30)
-            print("✅ All 4 endpoints return JSON matching API documentation exactly")
-            print("✅ Request/response schemas validated")
-            print("✅ Crew kickoff happens at correct timing (Steps 1 & 3)")
-            print("✅ Workflow integration logic verified")
+    _validate_api_response_schema(approval_response, "submit_payment_approval")
+    logger.info("   ✅ submit_payment_approval response matches API documentation")
+    logger.info("   📊 Execution Status: %s", approval_response['execution_status'])
+    
+    # ==================== STEP 4: Get Payment Execution Result ====================
+    logger.info("\n📊 STEP 4: GET /payment_execution_result/%s - JSON Schema Validation", proposal_id)
+    
+    resp4 = client.get(f'/payment_execution_result/{proposal_id}')
+    assert resp4.status_code == 200
+    execution_result = orjson.loads(resp4.data)
+    
+    _validate_api_response_schema(execution_result, "payment_execution_result")
+    logger.info("   ✅ payment_execution_result response matches API documentation")
+    logger.info("   📊 Executed: %s, Failed: %s", len(execution_result['executed_payments']), len(execution_result['failed_payments']))
+    
+    logger.info("\n🎯 VALIDATION SUMMARY")
+    logger.info("=" * 30)
+    logger.info("✅ All 4 endpoints return JSON matching API documentation exactly")
+    logger.info("✅ Request/response schemas validated")
+    logger.info("✅ Crew kickoff happens at correct timing (Steps 1 & 3)")
+    logger.info("✅ Workflow integration logic verified")
 
 
-def test_crew_kickoff_timing():
+def test_crew_kickoff_timing(clear_storage, crew_mocks, client, excel_upload, config_json):
     """Test that crew is kicked off at the correct points in the workflow."""
     
-    print("\n🤖 CREW KICKOFF TIMING VALIDATION")
-    print("=" * 40)
+    logger.info("\n🤖 CREW KICKOFF TIMING VALIDATION")
+    logger.info("=" * 40)
     
-    excel_bytes, cfg = _load_test_data()
     
-    with patch('flask_server.generate_payment_proposal_adapter') as mock_proposal_gen, \
-         patch('flask_server.execute_payment_approval_adapter') as mock_execution:
-        
-        mock_proposal_gen.return_value = {"proposal_id": "test", "report": "test", "payments": []}
-        mock_execution.return_value = {"execution_status": "SUCCESS", "message": "test"}
-        
-        with app.test_client() as client:
-            
-            # Submit request - should trigger crew kickoff #1
-            data = {
-                'json': json.dumps(cfg),
-                'excel': (io.BytesIO(excel_bytes), 'test.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
-            }
-            resp1 = client.post('/submit_request', data=data)
-            proposal_id = resp1.get_json()['proposal_id']
-            
-            # Verify crew was called for proposal generation
-            mock_proposal_gen.assert_called_once()
-            print("✅ Crew Kickoff #1: Risk assessment + proposal generation (submit_request)")
-            
-            # Get proposal - should NOT trigger crew
-            resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
-            assert resp2.status_code == 200
-            print("✅ No crew kickoff during get_payment_proposal (correct)")
-            
-            # Submit approval - should trigger crew kickoff #2
-            approval_data = {
-                'proposal_id': proposal_id,
-                'custody_wallet': '0x123',
-                'private_key': 'test',
-                'approval_decision': 'approve_all'
-            }
-            resp3 = client.post('/submit_payment_approval', json=approval_data)
-            
-            # Verify crew was called for payment execution
-            mock_execution.assert_called_once()
-            print("✅ Crew Kickoff #2: Payment execution with HITL (submit_payment_approval)")
-            
-            # Get execution result - should NOT trigger crew
-            resp4 = client.get(f'/payment_execution_result/{proposal_id}')
-            assert resp4.status_code == 200
-            print("✅ No crew kickoff during get_payment_execution_result (correct)")
-            
-            print("\n🎯 CREW TIMING VALIDATION COMPLETE")
-            print("✅ Crew triggered at exactly 2 points: Steps 1 & 3")
-            print("✅ No unnecessary crew calls during data retrieval")
+    mock_proposal_gen, mock_execution = crew_mocks
 
+    mock_proposal_gen.return_value = {"proposal_id": "test", "report": "test", "payments": []}
+    mock_execution.return_value = {"execution_status": "SUCCESS", "message": "test"}
+    
+    # Submit request - should trigger crew kickoff #1
+    data = {
+        'json': config_json,
+        'excel': excel_upload('test.xlsx'),
+    }
+    resp1 = client.post('/submit_request', data=data)
+    proposal_id = orjson.loads(resp1.data)['proposal_id']
+    
+    # Verify crew was called for proposal generation
+    mock_proposal_gen.assert_called_once()
+    logger.info("✅ Crew Kickoff #1: Risk assessment + proposal generation (submit_request)")
+    
+    # Get proposal - should NOT trigger crew
+    resp2 = client.get(f'/get_payment_proposal/{proposal_id}')
+    assert resp2.status_code == 200
+    logger.info("✅ No crew kickoff during get_payment_proposal (correct)")
+    
+    # Submit approval - should trigger crew kickoff #2
+    approval_data = {
+        'proposal_id': proposal_id,
+        'custody_wallet': '0x123',
+        'private_key': 'test',
+        'approval_decision': 'approve_all'
+    }
+    resp3 = client.post('/submit_payment_approval', json=approval_data)
+    
+    # Verify crew was called for payment execution
+    mock_execution.assert_called_once()
+    logger.info("✅ Crew Kickoff #2: Payment execution with HITL (submit_payment_approval)")
+    
+    # Get execution result - should NOT trigger crew
+    resp4 = client.get(f'/payment_execution_result/{proposal_id}')
+    assert resp4.status_code == 200
+    logger.info("✅ No crew kickoff during get_payment_execution_result (correct)")
+    
+    logger.info("\n🎯 CREW TIMING VALIDATION COMPLETE")
+    logger.info("✅ Crew triggered at exactly 2 points: Steps 1 & 3")
+    logger.info("✅ No unnecessary crew calls during data retrieval")
 
-def test_request_validation_per_api_doc():
+
+def test_request_validation_per_api_doc(client, excel_upload):
     """Test request body validation matches API documentation requirements."""
     
-    print("\n📝 REQUEST VALIDATION PER API DOCUMENTATION")
-    print("=" * 50)
+    logger.info("\n📝 REQUEST VALIDATION PER API DOCUMENTATION")
+    logger.info("=" * 50)
     
-    with app.test_client() as client:
-        
-        # Test submit_request validation
-        print("Testing submit_request validation...")
-        
-        # Missing excel file
-        resp = client.post('/submit_request', data={'json': '{"user_id": "test"}'})
-        assert resp.status_code == 400
-        print("   ✅ Missing excel file → 400")
-        
-        # Missing json config  
-        excel_bytes, _ = _load_test_data()
-        resp = client.post('/submit_request', data={
-            'excel': (io.BytesIO(excel_bytes), 'test.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        })
-        assert resp.status_code == 400
-        print("   ✅ Missing json config → 400")
-        
-        # Test submit_payment_approval validation
-        print("Testing submit_payment_approval validation...")
-        
-        # Missing required fields
-        resp = client.post('/submit_payment_approval', json={'proposal_id': 'test'})
-        assert resp.status_code == 400
-        print("   ✅ Missing required fields → 400")
-        
-        # Invalid approval_decision
-        resp = client.post('/submit_payment_approval', json={
-            'proposal_id': 'test',
-            'custody_wallet': '0x123',
-            'private_key': 'test',
-            'approval_decision': 'invalid_decision'
-        })
-        assert resp.status_code == 400
-        print("   ✅ Invalid approval_decision → 400")
-        
-        print("\n✅ All request validation matches API documentation")
+    # Test submit_request validation
+    logger.info("Testing submit_request validation...")
+    
+    # Missing excel file
+    resp = client.post('/submit_request', data={'json': '{"user_id": "test"}'})
+    assert resp.status_code == 400
+    logger.info("   ✅ Missing excel file → 400")
+    
+    # Missing json config  
+    resp = client.post('/submit_request', data={
+        'excel': excel_upload('test.xlsx')
+    })
+    assert resp.status_code == 400
+    logger.info("   ✅ Missing json config → 400")
+    
+    # Test submit_payment_approval validation
+    logger.info("Testing submit_payment_approval validation...")
+    
+    # Missing required fields
+    resp = client.post('/submit_payment_approval', json={'proposal_id': 'test'})
+    assert resp.status_code == 400
+    logger.info("   ✅ Missing required fields → 400")
+    
+    # Invalid approval_decision
+    resp = client.post('/submit_payment_approval', json={
+        'proposal_id': 'test',
+        'custody_wallet': '0x123',
+        'private_key': 'test',
+        'approval_decision': 'invalid_decision'
+    })
+    assert resp.status_code == 400
+    logger.info("   ✅ Invalid approval_decision → 400")
+    
+    logger.info("\n✅ All request validation matches API documentation")
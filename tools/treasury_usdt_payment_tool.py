@@ -1,18 +1,164 @@
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Optional, Type
 from pydantic import BaseModel, Field
-from datetime import datetime, timedelta
+import asyncio
 import random
-import string
+import re
+import secrets
 import os
-import json
+import orjson
+import threading
+import time
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv, find_dotenv
-from web3 import Web3
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 from web3.exceptions import (
     TransactionNotFound, TimeExhausted, MismatchedABI, 
     InvalidTransaction, BlockNotFound, InvalidAddress, Web3ValidationError
 )
 
+# USDT contract ABI (simplified version with essential functions); built once at import
+_USDT_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "who", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "transfer",
+        "outputs": [],
+        "type": "function"
+    }
+]
+
+# Multicall3 ABI (only aggregate3 and getEthBalance are used)
+_MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# Both balance calls take a single address argument, so their calldata is
+# just a fixed 4-byte selector plus the left-padded address
+_BALANCE_OF_SELECTOR = bytes(Web3.keccak(text="balanceOf(address)")[:4])
+_GET_ETH_BALANCE_SELECTOR = bytes(Web3.keccak(text="getEthBalance(address)")[:4])
+
+# Mock ETH/USD price for the USD estimates, in integer cents; override with ETH_PRICE_USD (e.g. 3456.78)
+_DEFAULT_ETH_PRICE_CENTS = 350_000
+
+# Syntactic shape of an Ethereum address (no EIP-55 checksum verification)
+_ETH_ADDRESS_RE = re.compile(r'0x[0-9a-fA-F]{40}')
+
+
+def _ts(epoch: Optional[float] = None) -> str:
+    """Local 'YYYY-MM-DD HH:MM:SS' timestamp, formatted without strftime."""
+    t = time.localtime(epoch)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+
+@lru_cache(maxsize=1024)
+def _checksum(address: str) -> str:
+    """EIP-55 checksum address; memoized since agents re-check the same wallets."""
+    return Web3.to_checksum_address(address)
+
+
+def _usd(cents: int) -> str:
+    """'1234.56' from integer cents."""
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def _eth_price_cents_from_env() -> int:
+    """ETH_PRICE_USD parsed once into integer cents; bad values warn and fall back to the default."""
+    raw = os.getenv('ETH_PRICE_USD')
+    if raw is None:
+        return _DEFAULT_ETH_PRICE_CENTS
+    try:
+        price = Decimal(raw.strip())
+    except InvalidOperation:
+        price = None
+    if price is None or not price.is_finite() or price <= 0:
+        print(f"Warning: Invalid ETH_PRICE_USD {raw!r}; using {_usd(_DEFAULT_ETH_PRICE_CENTS)}.")
+        return _DEFAULT_ETH_PRICE_CENTS
+    return int((price * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def _is_transient_rpc_error(e: Exception) -> bool:
+    """Timeouts, dropped connections and HTTP 429 rate limiting are worth one more try."""
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is not None and e.response.status_code == 429
+    return isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+def _rpc_with_retry(fn, retries: int = 1, backoff: float = 0.5):
+    """Call an RPC, retrying transient failures at most `retries` times with jittered backoff."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not _is_transient_rpc_error(e):
+                raise
+        time.sleep(backoff * 2 ** attempt + random.uniform(0, 0.1))
+
+
+def _http_provider(url: str, session: requests.Session):
+    """Sync Infura provider with web3's own retries off, so _rpc_with_retry is the only layer."""
+    try:
+        # web3 v7 retries inside HTTPProvider unless told not to
+        return Web3.HTTPProvider(url, request_kwargs={"timeout": 10}, session=session,
+                                 exception_retry_configuration=None)
+    except TypeError:
+        # web3 v6 retries through a provider middleware instead
+        provider = Web3.HTTPProvider(url, request_kwargs={"timeout": 10}, session=session)
+        provider.middlewares = ()
+        return provider
+
+
+def _decode_balances(results) -> tuple:
+    """(eth_wei, usdt_balance) from the aggregate3 results of _balance_calls."""
+    (_, eth_data), (_, usdt_data) = results
+    # Both results are a single ABI-encoded uint256
+    return int.from_bytes(eth_data, 'big'), int.from_bytes(usdt_data, 'big') / 10**6
+
 
 class USDTPaymentInput(BaseModel):
     """Input schema for TreasuryUSDTPaymentTool."""
@@ -46,144 +192,239 @@ class TreasuryUSDTPaymentTool(BaseTool):
         self._usdt_contract_address = '0xdAC17F958D2ee523a2206206994597C13D831ec7'
         self._w3 = None
         self._usdt_contract = None
+        # Multicall3 is deployed at the same address on mainnet and most EVM chains
+        self._multicall_address = '0xcA11bde05977b3631167028862bE2a173976CA11'
+        self._multicall = None
+        # Async twins of the provider and Multicall3 contract, used by _arun
+        self._aw3 = None
+        self._multicall_async = None
         self._max_usdt_gas = 401000
-        self._min_eth_balance_for_transaction = 0.0005
-        
-        # Initialize Web3 if Infura key is available
-        if self._infura_key:
-            self._initialize_web3()
-            self._load_usdt_contract()
+        self._min_eth_wei_for_transaction = 500_000_000_000_000  # 0.0005 ETH
+        self._eth_price_cents = _eth_price_cents_from_env()
+        # Gas price moves slowly relative to the 12s block time; reuse it for a few blocks
+        self._gas_price_ttl_seconds = 30.0
+        self._gas_price_cache = {"value": None, "expires_at": 0.0}
+        self._gas_price_lock = threading.Lock()
+        # Web3 and the contracts are set up on the first RPC-backed action (see _ensure_web3),
+        # so instantiating the tool costs no network setup
+        self._web3_initialized = False
+        self._web3_lock = threading.Lock()
+
+        # Action name -> handler; each entry picks the _run arguments its method needs
+        self._dispatch = {
+            "check_balance": lambda wallet, recipient, amount, key, tx_id, pay_id:
+                self._check_balance(wallet),
+            "estimate_gas": lambda wallet, recipient, amount, key, tx_id, pay_id:
+                self._estimate_gas(),
+            "execute_payment": lambda wallet, recipient, amount, key, tx_id, pay_id:
+                self._execute_payment(wallet, recipient, amount, key, payment_id=pay_id),
+            "validate_address": lambda wallet, recipient, amount, key, tx_id, pay_id:
+                self._validate_address(wallet or recipient),
+            "check_status": lambda wallet, recipient, amount, key, tx_id, pay_id:
+                self._check_status(tx_id),
+        }
+
+    def _ensure_web3(self):
+        """Initialize Web3 once, on first use, if an Infura key is available."""
+        if self._web3_initialized:
+            return
+        # The tool is shared across request threads; only one of them runs the setup
+        with self._web3_lock:
+            if self._web3_initialized:
+                return
+            if self._infura_key:
+                self._initialize_web3()
+            self._web3_initialized = True
 
     def _initialize_web3(self):
         """Initialize Web3 connection to Ethereum mainnet."""
         try:
-            self._w3 = Web3(Web3.HTTPProvider(f'https://mainnet.infura.io/v3/{self._infura_key}'))
-            if not self._w3.is_connected():
+            # Pooled keep-alive session so repeated RPCs reuse one TLS connection;
+            # transient failures are retried once by _rpc_with_retry, not by urllib3 or web3
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+            session.mount('https://', adapter)
+            w3 = Web3(_http_provider(f'https://mainnet.infura.io/v3/{self._infura_key}', session))
+            if not w3.is_connected():
                 print("Warning: Failed to connect to Ethereum node. Using simulation mode.")
-                self._w3 = None
-            else:
-                print("Connected to Ethereum mainnet")
+                return
+            print("Connected to Ethereum mainnet")
+            aw3 = AsyncWeb3(AsyncHTTPProvider(
+                f'https://mainnet.infura.io/v3/{self._infura_key}',
+                request_kwargs={"timeout": 10},
+            ))
         except Exception as e:
             print(f"Warning: Could not initialize Web3: {str(e)}. Using simulation mode.")
-            self._w3 = None
+            return
 
-    def _load_usdt_contract(self):
-        """Load USDT contract ABI and initialize contract instance."""
-        if not self._w3:
+        contracts = self._load_usdt_contract(w3, aw3)
+        if contracts is None:
             return
-            
-        # USDT contract ABI (simplified version with essential functions)
-        usdt_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "who", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "", "type": "uint256"}],
-                "type": "function"
-            },
-            {
-                "constant": False,
-                "inputs": [
-                    {"name": "_to", "type": "address"},
-                    {"name": "_value", "type": "uint256"}
-                ],
-                "name": "transfer",
-                "outputs": [],
-                "type": "function"
-            }
-        ]
-        
+        # Publish the contracts before _w3: callers treat a set _w3 as "contracts ready"
+        self._usdt_contract, self._multicall, self._multicall_async = contracts
+        self._aw3 = aw3
+        self._w3 = w3
+
+    def _load_usdt_contract(self, w3, aw3):
+        """Build the USDT and Multicall3 contract instances (None if that fails)."""
         try:
-            self._usdt_contract = self._w3.eth.contract(
+            usdt_contract = w3.eth.contract(
                 address=self._usdt_contract_address, 
-                abi=usdt_abi
+                abi=_USDT_ABI
+            )
+            multicall = w3.eth.contract(
+                address=self._multicall_address,
+                abi=_MULTICALL3_ABI
+            )
+            multicall_async = aw3.eth.contract(
+                address=self._multicall_address,
+                abi=_MULTICALL3_ABI
             )
         except Exception as e:
-            print(f"Warning: Could not load USDT contract: {str(e)}")
+            print(f"Warning: Could not load USDT contract: {str(e)}. Using simulation mode.")
+            return None
+        return usdt_contract, multicall, multicall_async
 
     def _run(self, action: str, wallet_address: str = "", recipient_address: str = "", 
              amount_usdt: float = 0.0, private_key: str = "", transaction_id: str = "", payment_id: str = "") -> str:
         
+        handler = self._dispatch.get(action)
+        if handler is None:
+            return f"Unknown action: {action}. Available actions: {', '.join(self._dispatch)}"
+        return handler(wallet_address, recipient_address, amount_usdt, private_key, transaction_id, payment_id)
+
+    async def _arun(self, action: str, wallet_address: str = "", recipient_address: str = "", 
+                    amount_usdt: float = 0.0, private_key: str = "", transaction_id: str = "", payment_id: str = "") -> str:
         if action == "check_balance":
-            return self._check_balance(wallet_address)
-        elif action == "estimate_gas":
-            return self._estimate_gas()
-        elif action == "execute_payment":
-            return self._execute_payment(wallet_address, recipient_address, amount_usdt, private_key, payment_id=payment_id)
-        elif action == "validate_address":
-            return self._validate_address(wallet_address or recipient_address)
-        elif action == "check_status":
-            return self._check_status(transaction_id)
-        else:
-            return f"Unknown action: {action}. Available actions: check_balance, estimate_gas, execute_payment, validate_address, check_status"
+            return await self._check_balance_async(wallet_address)
+        # Other actions are simulated or a single RPC; run the sync path off the event loop
+        return await asyncio.to_thread(
+            self._run, action, wallet_address, recipient_address, amount_usdt, private_key, transaction_id, payment_id
+        )
 
     def _check_balance(self, wallet_address: str) -> str:
         """Check USDT and ETH balance for a wallet address."""
         if not wallet_address:
             return "Error: Wallet address is required for balance check."
         
+        self._ensure_web3()
+        
         if not self._w3:
             # Simulation mode
-            eth_balance = random.uniform(0.1, 0.5)
+            eth_wei = int(random.uniform(0.1, 0.5) * 10**18)
             usdt_balance = random.uniform(2000, 5000)  # Increased to support test payments
-            eth_usd_value = eth_balance * 3500  # Mock ETH price
         else:
             try:
-                address = Web3.to_checksum_address(wallet_address)
-                
-                # Get ETH balance
-                balance_wei = self._w3.eth.get_balance(address)
-                eth_balance = self._w3.from_wei(balance_wei, 'ether')
-                
-                # Get USDT balance
-                balance_wei = self._usdt_contract.functions.balanceOf(address).call()
-                usdt_balance = float(balance_wei) / 10**6
-                
-                # Get ETH price (simplified)
-                eth_usd_value = float(eth_balance) * 3500  # Mock price
-                
+                # Get ETH and USDT balances in one eth_call through Multicall3
+                results = _rpc_with_retry(self._multicall.functions.aggregate3(self._balance_calls(wallet_address)).call)
+                eth_wei, usdt_balance = _decode_balances(results)
             except Exception as e:
                 return f"Error checking balance: {str(e)}"
         
-        result = f"Wallet Balance Check:\n"
-        result += f"Address: {wallet_address}\n"
-        result += f"ETH Balance: {eth_balance:.6f} ETH (≈${eth_usd_value:.2f})\n"
-        result += f"USDT Balance: {usdt_balance:.2f} USDT\n"
-        result += f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        return self._format_balance(wallet_address, eth_wei, usdt_balance)
+
+    async def _check_balance_async(self, wallet_address: str) -> str:
+        """Async check_balance that overlaps the balance multicall with a gas price fetch.
+
+        The gas price lands in the gas price cache, so an estimate_gas issued right
+        after (the usual pre-payment sequence) costs no extra round-trip.
+        """
+        if not wallet_address:
+            return "Error: Wallet address is required for balance check."
+        
+        await asyncio.to_thread(self._ensure_web3)
+        if not self._multicall_async:
+            return await asyncio.to_thread(self._check_balance, wallet_address)
+        
+        try:
+            results, gas_price_wei = await asyncio.gather(
+                self._multicall_async.functions.aggregate3(self._balance_calls(wallet_address)).call(),
+                self._aw3.eth.gas_price,
+            )
+            eth_wei, usdt_balance = _decode_balances(results)
+        except Exception as e:
+            return f"Error checking balance: {str(e)}"
+        
+        self._cache_gas_price(gas_price_wei)
+        return self._format_balance(wallet_address, eth_wei, usdt_balance)
+
+    def _balance_calls(self, wallet_address: str) -> list:
+        """Multicall3 aggregate3 calls for the ETH and USDT balances of a wallet."""
+        address = _checksum(wallet_address)
+        address_word = bytes.fromhex(address[2:]).rjust(32, b"\0")
+        return [
+            (self._multicall_address, False, _GET_ETH_BALANCE_SELECTOR + address_word),
+            (self._usdt_contract_address, False, _BALANCE_OF_SELECTOR + address_word),
+        ]
+
+    def _format_balance(self, wallet_address: str, eth_wei: int, usdt_balance: float) -> str:
+        """Render the balance report shared by the sync and async paths."""
+        # ETH stays in integer wei and USD in integer cents; floats are for display only
+        eth_balance = eth_wei / 10**18
+        eth_usd_cents = eth_wei * self._eth_price_cents // 10**18
         
         # Add balance status
-        if eth_balance < self._min_eth_balance_for_transaction:
-            result += f"⚠️  Warning: ETH balance may be insufficient for gas fees\n"
+        warning = ""
+        if eth_wei < self._min_eth_wei_for_transaction:
+            warning = "⚠️  Warning: ETH balance may be insufficient for gas fees\n"
         
-        return result
+        return (
+            f"Wallet Balance Check:\n"
+            f"Address: {wallet_address}\n"
+            f"ETH Balance: {eth_balance:.6f} ETH (≈${_usd(eth_usd_cents)})\n"
+            f"USDT Balance: {usdt_balance:.2f} USDT\n"
+            f"Timestamp: {_ts()}\n"
+            f"{warning}"
+        )
+
+    def _get_gas_price(self) -> int:
+        """Current gas price in wei, cached for _gas_price_ttl_seconds."""
+        with self._gas_price_lock:
+            cache = self._gas_price_cache
+            if cache["value"] is not None and time.monotonic() < cache["expires_at"]:
+                return cache["value"]
+        # Fetch outside the lock so a slow RPC never stalls other callers;
+        # threads racing on expiry may each fetch, and the last one wins
+        gas_price_wei = _rpc_with_retry(lambda: self._w3.eth.gas_price)
+        self._cache_gas_price(gas_price_wei)
+        return gas_price_wei
+
+    def _cache_gas_price(self, gas_price_wei: int) -> None:
+        """Publish a freshly fetched gas price (sync fetch or the async balance path)."""
+        with self._gas_price_lock:
+            self._gas_price_cache["value"] = gas_price_wei
+            self._gas_price_cache["expires_at"] = time.monotonic() + self._gas_price_ttl_seconds
 
     def _estimate_gas(self) -> str:
         """Estimate gas cost for USDT transaction."""
+        self._ensure_web3()
         if not self._w3:
             # Simulation mode
-            gas_price_gwei = random.uniform(20, 50)
-            gas_limit = self._max_usdt_gas
-            adjusted_gas_price = gas_price_gwei * 1.35
+            gas_price_wei = int(random.uniform(20, 50) * 10**9)
         else:
             try:
-                gas_price_gwei = self._w3.eth.gas_price
-                gas_price_gwei = self._w3.from_wei(gas_price_gwei, 'gwei')
-                gas_limit = self._max_usdt_gas
-                adjusted_gas_price = gas_price_gwei * 1.35  # Add 35% buffer for USDT
+                gas_price_wei = self._get_gas_price()
             except Exception as e:
                 return f"Error estimating gas: {str(e)}"
         
-        gas_cost_eth = (adjusted_gas_price * gas_limit) / 1_000_000_000
+        # Stay in integer wei/cents; convert to gwei/ETH floats only for display
+        gas_limit = self._max_usdt_gas
+        adjusted_wei = gas_price_wei * 135 // 100  # Add 35% buffer for USDT
+        gas_price_gwei = gas_price_wei / 10**9
+        adjusted_gas_price = adjusted_wei / 10**9
+        gas_cost_wei = adjusted_wei * gas_limit
+        gas_cost_eth = gas_cost_wei / 10**18
+        gas_cost_cents = gas_cost_wei * self._eth_price_cents // 10**18
         
-        result = f"Gas Estimation for USDT Transaction:\n"
-        result += f"Current Gas Price: {gas_price_gwei:.2f} Gwei\n"
-        result += f"Adjusted Gas Price: {adjusted_gas_price:.2f} Gwei (35% buffer)\n"
-        result += f"Gas Limit: {gas_limit:,} units\n"
-        result += f"Estimated Cost: {gas_cost_eth:.6f} ETH\n"
-        result += f"Estimated Cost USD: ${gas_cost_eth * 3500:.2f} (at $3500/ETH)\n"
-        result += f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        
-        return result
+        return (
+            f"Gas Estimation for USDT Transaction:\n"
+            f"Current Gas Price: {gas_price_gwei:.2f} Gwei\n"
+            f"Adjusted Gas Price: {adjusted_gas_price:.2f} Gwei (35% buffer)\n"
+            f"Gas Limit: {gas_limit:,} units\n"
+            f"Estimated Cost: {gas_cost_eth:.6f} ETH\n"
+            f"Estimated Cost USD: ${_usd(gas_cost_cents)} (at ${_usd(self._eth_price_cents)}/ETH)\n"
+            f"Timestamp: {_ts()}\n"
+        )
 
     def _execute_payment(self, wallet_address: str, recipient_address: str, 
                         amount_usdt: float, private_key: str, payment_id: str = "") -> str:
@@ -200,9 +441,9 @@ class TreasuryUSDTPaymentTool(BaseTool):
                 "from": wallet_address or "",
                 "to": recipient_address or "",
                 "amount": amount_usdt,
-                "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                "timestamp": _ts()
             }
-            return json.dumps(payload)
+            return orjson.dumps(payload).decode()
 
         # Basic validations
         if not recipient_address:
@@ -214,14 +455,17 @@ class TreasuryUSDTPaymentTool(BaseTool):
         if not private_key:
             return fail("MISSING_PRIVATE_KEY")
 
+        # Only connect once the request has passed the cheap argument checks
+        self._ensure_web3()
+
         # Generate mock transaction ID
-        tx_id = 'TX' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+        tx_id = 'TX' + secrets.token_hex(4).upper()
 
         # Validate addresses (when connected to web3)
         try:
             if self._w3:
-                Web3.to_checksum_address(wallet_address)
-                Web3.to_checksum_address(recipient_address)
+                _checksum(wallet_address)
+                _checksum(recipient_address)
         except Exception as e:
             return fail(f"INVALID_ADDRESS_FORMAT: {str(e)}")
 
@@ -233,13 +477,10 @@ class TreasuryUSDTPaymentTool(BaseTool):
         processing_time = random.randint(1, 3)  # 1-3 seconds simulation
 
         # Mock execution with realistic scenarios
-        success_rate = 0.98  # 98% success rate
-
-        if random.random() < success_rate:
+        # ~98% success rate as one 10-bit draw: 1004/1024 ≈ 98.05%
+        if random.getrandbits(10) >= 20:
             status = "SUCCESS"
-            estimated_completion = datetime.now() + timedelta(
-                minutes=random.randint(1, 5)
-            )
+            estimated_completion = time.time() + 60 * random.randint(1, 5)
             payload = {
                 "payment_id": payment_id or "",
                 "status": status,
@@ -248,10 +489,10 @@ class TreasuryUSDTPaymentTool(BaseTool):
                 "to": recipient_address,
                 "amount": amount_usdt,
                 "processing_time_seconds": processing_time,
-                "estimated_completion": estimated_completion.strftime('%Y-%m-%d %H:%M:%S'),
+                "estimated_completion": _ts(estimated_completion),
                 "note": "SIMULATION: Transaction would be successful"
             }
-            return json.dumps(payload)
+            return orjson.dumps(payload).decode()
         else:
             failures = [
                 "INSUFFICIENT_USDT_BALANCE",
@@ -259,7 +500,7 @@ class TreasuryUSDTPaymentTool(BaseTool):
                 "INVALID_RECIPIENT_ADDRESS",
                 "NETWORK_TIMEOUT"
             ]
-            status = random.choice(failures)
+            status = failures[random.getrandbits(2)]  # four failure modes
             payload = {
                 "payment_id": payment_id or "",
                 "status": "FAILED",
@@ -270,38 +511,41 @@ class TreasuryUSDTPaymentTool(BaseTool):
                 "processing_time_seconds": processing_time,
                 "note": "SIMULATION: Transaction would fail"
             }
-            return json.dumps(payload)
+            return orjson.dumps(payload).decode()
 
     def _validate_address(self, address: str) -> str:
         """Validate if an address is a valid Ethereum address."""
         if not address:
             return "Error: Address is required for validation."
         
+        self._ensure_web3()
+        
         try:
             if self._w3:
-                Web3.to_checksum_address(address)
+                checksummed = _checksum(address)
             else:
                 # Basic validation for simulation mode
-                if not address.startswith('0x') or len(address) != 42:
+                if not _ETH_ADDRESS_RE.fullmatch(address):
                     raise ValueError("Invalid address format")
+                checksummed = 'N/A (simulation)'
             
-            result = f"Address Validation Result:\n"
-            result += f"Address: {address}\n"
-            result += f"Status: ✅ VALID\n"
-            result += f"Format: Ethereum address\n"
-            result += f"Checksum: {Web3.to_checksum_address(address) if self._w3 else 'N/A (simulation)'}\n"
-            result += f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            
-            return result
+            return (
+                f"Address Validation Result:\n"
+                f"Address: {address}\n"
+                f"Status: ✅ VALID\n"
+                f"Format: Ethereum address\n"
+                f"Checksum: {checksummed}\n"
+                f"Timestamp: {_ts()}\n"
+            )
             
         except Exception as e:
-            result = f"Address Validation Result:\n"
-            result += f"Address: {address}\n"
-            result += f"Status: ❌ INVALID\n"
-            result += f"Error: {str(e)}\n"
-            result += f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            
-            return result
+            return (
+                f"Address Validation Result:\n"
+                f"Address: {address}\n"
+                f"Status: ❌ INVALID\n"
+                f"Error: {str(e)}\n"
+                f"Timestamp: {_ts()}\n"
+            )
 
     def _check_status(self, transaction_id: str) -> str:
         """Check transaction status (simulated)."""
@@ -320,19 +564,20 @@ class TreasuryUSDTPaymentTool(BaseTool):
         
         status, description = random.choice(statuses)
         
-        result = f"Transaction Status Check (SIMULATION MODE):\n"
-        result += f"Transaction ID: {transaction_id}\n"
-        result += f"Current Status: {status}\n"
-        result += f"Description: {description}\n"
-        result += f"Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        
+        outcome = ""
         if status == "COMPLETED":
-            result += f"✅ SIMULATION: Transaction would be completed successfully!\n"
+            outcome = "✅ SIMULATION: Transaction would be completed successfully!\n"
         elif status == "FAILED":
-            result += f"❌ SIMULATION: Transaction would have failed.\n"
+            outcome = "❌ SIMULATION: Transaction would have failed.\n"
         elif status in ["PROCESSING", "PENDING"]:
-            result += f"⏳ SIMULATION: Transaction would be in progress.\n"
-        
-        result += f"📝 Note: This is a simulation. Real status would be checked here.\n"
+            outcome = "⏳ SIMULATION: Transaction would be in progress.\n"
         
-        return result 
\ No newline at end of file
+        return (
+            f"Transaction Status Check (SIMULATION MODE):\n"
+            f"Transaction ID: {transaction_id}\n"
+            f"Current Status: {status}\n"
+            f"Description: {description}\n"
+            f"Last Updated: {_ts()}\n"
+            f"{outcome}"
+            f"📝 Note: This is a simulation. Real status would be checked here.\n"
+        ) 
\ No newline at end of file